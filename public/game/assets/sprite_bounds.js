@@ -0,0 +1,39 @@
+// Generated by tools/sprite_bounds.py from the spritesheet - do not edit.
+// Opaque box (x, y, w, h) of every sprite relative to the sprite, and the opaque
+// [left, right) columns of each row of that box as [rows, left, right, ...] runs
+var SPRITE_BOUNDS = {
+  PALM_TREE:              { sw:  215, sh:  540, x:    0, y:    0, w:  215, h:  540, rows: [3,148,160,2,23,160,3,20,155,2,18,153,5,15,153,3,15,148,2,25,150,3,38,148,2,50,145,3,63,175,2,63,180,3,75,188,2,90,190,3,50,193,2,43,195,3,38,198,2,33,200,3,28,200,2,23,203,3,20,203,2,18,203,3,15,205,2,13,205,5,10,205,5,8,205,3,5,205,2,5,183,3,3,188,2,3,190,3,0,193,2,0,195,3,0,198,2,0,200,3,0,203,5,0,205,2,0,208,3,0,210,5,0,213,17,0,215,5,5,215,8,5,208,10,8,208,2,10,205,3,10,195,5,13,195,2,38,195,5,38,170,8,38,173,2,40,173,5,40,175,5,80,175,3,83,178,2,85,178,3,98,178,5,100,178,2,103,178,3,105,180,2,108,180,3,128,180,7,130,180,3,133,180,2,135,180,15,160,183,3,160,185,5,160,188,2,163,188,10,163,185,10,163,188,8,165,188,27,165,190,18,168,193,32,168,195,33,168,198,20,165,198,12,165,195,8,165,193,17,163,193,8,163,190,15,160,190,10,158,190,2,158,188,5,155,188,8,155,185,2,153,185,10,153,183,8,150,183,5,148,183,2,145,183,3,145,188,2,143,190,3,140,193,2,143,195,3,140,193,2,143,195,3,140,193,2,143,190,3,145,188,2,153,180] },
+  BILLBOARD08:            { sw:  385, sh:  265, x:    5, y:    3, w:  375, h:  262, rows: [11,175,213,2,180,208,3,183,205,2,190,195,5,5,380,5,8,378,218,10,378,16,15,373] },
+  TREE1:                  { sw:  360, sh:  360, x:    0, y:    0, w:  360, h:  360, rows: [3,133,225,2,103,225,3,105,250,2,103,253,3,100,255,2,95,268,3,93,273,2,95,273,3,88,275,2,88,278,3,73,283,2,73,285,3,75,310,5,58,310,2,58,315,5,43,320,3,40,315,2,38,313,3,40,318,2,40,320,3,38,320,2,33,318,3,33,320,2,30,320,3,33,315,2,30,318,3,33,320,2,30,318,3,33,320,2,40,320,5,40,333,3,45,333,2,38,333,3,38,330,2,43,333,3,40,335,2,40,338,3,30,340,2,30,338,3,33,340,7,30,340,3,28,340,2,28,338,3,23,340,2,20,338,5,18,330,3,18,338,2,20,340,5,15,335,3,8,335,2,8,348,3,8,350,5,5,353,2,5,355,3,0,355,2,0,358,5,0,360,3,0,358,2,3,355,3,5,360,2,18,360,3,20,360,2,23,358,3,80,358,2,83,360,3,80,360,2,85,360,3,150,358,2,153,358,3,160,355,2,165,355,3,173,358,2,178,353,3,180,345,2,185,348,3,188,340,2,190,340,3,195,338,2,200,338,3,203,335,2,205,318,3,210,310,2,213,303,3,215,300,2,218,300,5,220,290,5,223,288,5,225,285,3,228,285,2,228,283,5,230,283,3,233,283,2,233,280,3,235,280,2,238,280,8,238,278,2,238,275,10,240,275,10,240,273,13,240,275,2,240,278,5,238,278,3,238,280,2,235,280,3,235,283,2,233,285,3,233,288,2,230,288,3,230,290,2,228,295,3,225,300,2,223,303,3,198,310,2,190,313,3,188,318,2,190,320,3,188,318,2,195,320] },
+  DEAD_TREE1:             { sw:  135, sh:  332, x:    0, y:    0, w:  135, h:  332, rows: [3,65,68,2,65,73,3,65,68,2,50,75,3,50,68,2,53,68,5,50,85,3,53,83,2,53,80,3,50,78,2,50,93,3,55,90,2,50,88,3,45,80,2,63,75,5,38,93,3,60,88,2,45,85,3,48,93,2,38,95,3,38,93,2,40,95,3,40,88,2,43,83,3,45,100,2,55,100,3,40,100,2,33,100,3,33,105,2,33,100,3,33,95,2,38,95,3,38,93,2,40,93,3,33,98,2,33,100,5,38,100,3,25,105,2,33,103,3,33,98,2,28,95,3,28,93,5,38,100,2,40,98,5,33,95,3,28,98,2,45,108,3,40,108,2,25,105,3,25,103,2,20,108,5,25,108,3,15,108,2,15,105,3,18,108,2,18,118,3,20,118,5,20,115,2,25,113,5,28,110,3,30,123,2,25,118,3,10,115,2,18,113,3,20,110,2,0,120,3,0,115,2,3,118,3,3,120,2,5,103,3,8,103,2,10,115,3,10,113,2,13,120,3,13,113,2,13,108,3,15,105,5,18,103,5,20,105,2,23,95,3,10,95,2,18,103,3,30,103,2,25,105,3,28,103,2,33,113,3,40,110,2,25,108,3,25,103,2,28,98,3,28,95,2,30,95,3,30,98,2,30,100,3,28,105,2,33,108,3,40,83,2,43,83,5,45,75,3,48,73,2,50,73,3,43,70,2,45,70,3,50,70,2,53,75,23,55,70,2,53,88,3,23,108,2,15,113,3,3,135,2,5,128,3,8,90,2,40,83,2,43,75] },
+  BILLBOARD09:            { sw:  328, sh:  282, x:    0, y:    0, w:  328, h:  282, rows: [282,0,328] },
+  BOULDER3:               { sw:  320, sh:  220, x:    0, y:    0, w:  320, h:  220, rows: [5,48,268,10,30,285,5,28,288,5,20,288,5,20,290,8,18,293,2,15,293,5,15,295,5,13,298,18,10,300,17,8,300,5,8,298,5,8,295,13,5,295,2,8,298,3,10,298,2,15,298,3,25,300,2,15,300,8,15,303,15,15,305,2,18,305,3,18,308,7,20,308,8,15,308,5,18,308,5,20,308,2,20,310,3,20,308,2,20,310,3,20,308,2,20,318,3,18,320,2,13,318,3,3,320,2,0,318,3,3,315,2,0,313,3,3,305,2,5,303,3,8,295,2,15,288,3,28,280,2,40,268,3,68,235,2,105,198] },
+  COLUMN:                 { sw:  200, sh:  315, x:    0, y:    0, w:  200, h:  315, rows: [3,108,133,2,50,135,3,45,135,2,45,173,3,15,178,2,15,183,3,10,185,25,8,188,2,8,185,3,10,183,2,13,180,3,15,178,2,18,178,45,18,175,3,15,175,142,18,175,3,18,178,2,15,178,3,15,180,2,13,180,5,10,183,3,8,185,2,5,185,5,5,188,20,5,190,3,5,193,2,3,200,3,0,198,2,3,200,3,0,198,2,8,195,3,15,188,2,33,180,3,45,158,2,68,130] },
+  BILLBOARD01:            { sw:  300, sh:  170, x:    0, y:    0, w:  300, h:  170, rows: [138,0,293,2,0,300,3,0,298,2,0,300,3,0,298,2,0,300,3,0,298,2,0,300,3,0,298,2,0,295,3,0,298,2,0,295,3,0,293,2,3,290] },
+  BILLBOARD06:            { sw:  298, sh:  190, x:    0, y:    0, w:  298, h:  190, rows: [190,0,298] },
+  BILLBOARD05:            { sw:  298, sh:  190, x:    0, y:    0, w:  298, h:  190, rows: [10,123,161,3,128,156,2,131,153,3,138,143,5,0,283,142,3,283,3,3,298,2,3,296,3,6,293,2,11,291,3,11,288,2,11,286,3,11,283,2,11,281,3,11,278,2,11,276] },
+  BILLBOARD07:            { sw:  298, sh:  190, x:    0, y:    0, w:  298, h:  190, rows: [190,0,298] },
+  BOULDER2:               { sw:  298, sh:  140, x:    0, y:    0, w:  298, h:  140, rows: [3,131,166,2,121,183,3,111,183,2,98,203,3,98,201,5,98,203,2,96,206,3,86,206,2,81,208,3,76,208,2,68,253,3,63,271,2,56,278,3,51,278,2,48,293,3,36,293,2,33,293,3,21,293,2,13,293,3,11,296,2,8,296,3,8,293,2,6,293,8,3,293,5,3,291,2,8,291,3,8,288,5,3,288,35,3,293,2,6,293,3,0,293,2,3,296,3,6,298,2,3,296,3,6,278,2,3,256,3,11,238,2,28,216] },
+  TREE2:                  { sw:  282, sh:  295, x:    0, y:    0, w:  282, h:  295, rows: [3,115,188,2,103,200,3,98,205,2,78,210,3,75,215,2,63,218,3,65,220,2,53,233,3,50,230,2,48,233,3,45,243,2,38,243,3,40,235,2,38,245,3,33,248,2,33,253,3,30,250,2,40,253,3,30,250,5,25,253,2,25,248,3,23,260,2,20,260,3,20,263,2,15,263,5,20,270,3,18,268,2,15,273,3,13,270,2,13,273,3,10,273,2,13,278,3,10,275,2,13,275,3,8,273,2,8,278,3,5,278,2,8,258,3,3,278,5,5,278,2,5,280,3,5,275,2,5,282,3,3,282,2,0,280,3,5,282,2,3,282,3,3,280,10,0,278,2,0,280,3,5,275,2,5,278,3,0,278,2,0,273,3,5,268,2,3,275,3,0,268,2,5,278,3,0,278,2,0,270,3,3,278,5,5,260,2,8,268,3,8,263,2,10,260,3,15,260,2,60,260,3,23,258,2,38,260,3,30,250,2,50,255,3,58,173,2,60,173,3,65,173,2,75,173,3,105,173,2,83,173,3,105,173,7,108,170,3,108,168,7,110,168,5,110,165,8,113,165,5,118,165,5,120,165,5,120,168,5,120,170,2,118,170,3,113,173,2,108,173,5,105,173,3,68,243,2,40,263,3,15,265,2,15,268,3,20,273,2,25,250,5,35,225] },
+  BILLBOARD04:            { sw:  268, sh:  170, x:    0, y:    0, w:  268, h:  170, rows: [3,91,241,2,66,246,3,51,248,2,43,253,3,36,256,2,31,258,3,26,261,2,23,263,3,21,263,2,18,266,3,16,266,5,16,268,10,13,268,2,16,268,3,16,266,2,18,266,3,21,266,2,23,263,3,13,261,2,13,258,3,13,256,2,13,248,3,13,241,2,13,238,20,13,248,8,0,263,65,13,248,2,0,261,3,16,246,2,18,243] },
+  DEAD_TREE2:             { sw:  150, sh:  260, x:    0, y:    0, w:  150, h:  260, rows: [8,100,103,7,48,103,3,48,143,2,50,140,5,53,143,3,53,140,2,55,135,8,55,133,2,55,130,5,35,130,3,38,128,2,5,128,3,10,125,2,13,125,3,15,123,2,18,123,3,20,133,2,23,133,3,25,133,2,28,133,3,28,143,2,30,143,3,33,143,2,35,143,3,38,140,5,40,140,2,43,135,5,43,133,3,33,130,7,33,123,3,33,120,2,35,140,3,38,140,2,40,138,3,43,138,2,45,133,3,50,133,2,53,130,3,55,125,2,58,120,3,60,135,5,63,135,2,65,133,3,15,130,2,15,128,3,15,123,2,15,113,3,15,108,2,15,113,3,15,128,2,18,125,3,20,123,2,20,115,3,23,103,2,25,103,3,30,98,2,33,95,3,35,93,2,35,88,3,38,88,2,40,85,3,40,83,2,43,80,5,43,78,5,43,75,3,43,73,5,43,70,5,43,68,5,43,65,2,40,65,3,40,63,2,38,63,3,38,60,2,35,58,3,33,58,2,28,55,3,23,83,2,20,100,3,5,128,2,3,150,3,0,143,2,3,135,3,0,128,2,3,115,3,15,108,2,33,100] },
+  BOULDER1:               { sw:  168, sh:  248, x:    0, y:    0, w:  168, h:  248, rows: [3,103,128,3,101,131,2,96,131,3,93,133,2,93,136,3,93,138,5,91,138,2,88,146,3,88,148,5,86,148,2,83,148,3,81,151,2,78,153,3,76,153,5,73,156,2,71,161,3,68,161,5,66,163,5,63,163,2,61,163,5,61,166,3,61,168,7,58,168,8,56,168,7,53,168,3,51,166,2,51,163,3,43,163,2,41,161,3,38,158,2,36,156,3,33,156,2,31,156,3,26,156,2,21,156,3,18,158,2,18,161,10,16,161,5,16,163,5,13,166,5,11,168,15,8,168,5,6,168,18,3,168,5,0,163,7,0,161,3,3,161,2,3,156,5,6,156,5,8,156,3,11,156,2,13,156,3,16,156,2,18,153,3,21,153,2,13,161,3,11,158,2,3,161,3,11,158,2,8,161,3,16,153,2,28,136,3,26,138,2,48,116] },
+  BUSH1:                  { sw:  240, sh:  155, x:    0, y:    0, w:  240, h:  155, rows: [3,70,103,2,73,108,3,88,183,2,90,173,3,98,168,2,53,220,3,60,225,2,33,230,3,18,230,2,10,205,3,8,200,2,5,215,3,5,223,2,63,228,3,38,230,2,33,233,3,28,235,2,23,238,3,20,238,2,18,223,3,15,225,2,13,228,3,10,230,2,8,233,3,5,233,5,5,235,2,20,238,3,18,238,2,15,238,5,15,240,5,13,240,5,13,225,3,13,228,2,15,228,3,13,228,2,10,230,3,8,230,5,5,230,7,3,230,5,0,230,3,15,230,2,15,210,3,13,223,2,13,225,3,10,213,2,0,213,3,3,213,2,10,208,3,10,210,2,10,208,3,10,210,2,10,173,3,38,170,2,90,158] },
+  CACTUS:                 { sw:  235, sh:  118, x:    0, y:    0, w:  235, h:  118, rows: [3,150,158,3,148,160,2,145,163,3,145,165,2,143,165,3,143,185,2,143,188,5,143,190,3,145,190,2,148,190,3,150,190,5,163,188,2,120,185,3,65,183,2,65,180,3,63,173,2,33,188,3,30,190,2,28,215,3,28,218,5,28,220,2,5,218,3,3,215,2,3,213,3,5,208,2,10,203,3,23,210,2,20,213,3,23,210,2,25,220,3,10,228,2,3,230,3,0,233,2,3,235,3,0,233,2,3,230,3,0,228,2,3,225,3,0,223,2,3,215,3,10,208,2,23,200,3,40,188,2,63,160] },
+  BUSH2:                  { sw:  232, sh:  152, x:    0, y:    0, w:  232, h:  152, rows: [3,95,120,2,83,133,3,78,133,2,78,145,3,78,158,2,60,173,3,58,180,2,55,185,3,53,190,2,45,198,3,45,200,2,43,205,3,38,210,2,30,213,3,28,213,2,25,218,3,25,220,2,20,223,3,20,225,2,23,220,3,18,215,2,20,223,3,23,218,2,18,223,3,15,225,2,13,225,3,10,228,2,8,230,3,5,232,2,5,230,3,5,232,5,0,232,2,0,225,3,3,225,2,0,225,3,0,223,2,0,220,3,5,223,2,5,220,3,5,223,2,10,220,3,8,215,2,8,220,3,10,220,2,10,218,5,13,218,3,18,215,2,20,203,3,25,190,2,80,168,3,73,160,2,60,168,3,58,175,2,45,198,3,53,200,2,60,188,3,73,165,2,80,153,2,88,145] },
+  BILLBOARD03:            { sw:  230, sh:  220, x:    0, y:    0, w:  230, h:  220, rows: [5,28,208,3,13,215,2,8,223,3,5,225,5,5,228,2,5,225,3,8,225,2,28,208,3,8,220,2,8,230,3,10,230,2,8,230,3,5,225,2,8,223,3,28,208,2,8,225,5,8,228,3,5,228,2,5,225,3,5,223,2,10,223,3,8,225,5,5,225,2,8,225,3,0,225,2,0,208,3,3,220,2,5,228,8,5,230,2,8,228,3,28,208,5,5,228,7,5,230,3,8,228,2,8,208,3,5,223,2,5,228,8,5,230,2,5,228,3,5,220,2,5,225,3,5,228,2,8,228,5,10,230,3,25,220,2,8,225,3,5,228,5,5,230,2,8,228,3,10,225,2,18,218,43,28,208,2,28,228,3,28,225,2,28,223,3,28,215,2,28,213,3,28,210,2,28,208] },
+  BILLBOARD02:            { sw:  215, sh:  220, x:    0, y:    0, w:  215, h:  220, rows: [3,25,115,2,28,128,3,30,135,2,18,143,3,20,145,2,23,150,3,25,153,2,28,158,3,30,160,2,33,165,3,35,168,2,33,170,3,28,175,2,25,178,3,23,180,2,20,183,3,18,185,2,15,188,3,13,188,2,10,190,3,8,193,2,8,195,5,5,198,3,3,200,2,3,203,5,0,205,3,3,203,42,8,195,3,10,193,12,8,195,3,8,203,10,8,215,10,8,213,5,8,210,2,8,208,5,8,205,3,8,203,2,8,200,10,8,195,15,20,183,3,15,190,2,8,193,3,5,200,2,3,203,3,5,205,2,8,203,3,15,190,2,20,188,5,20,183] },
+  STUMP:                  { sw:  195, sh:  140, x:    0, y:    0, w:  195, h:  140, rows: [3,60,63,2,60,68,3,58,68,15,58,70,5,58,73,2,53,115,10,53,120,5,53,123,5,53,125,3,53,130,32,53,133,5,53,135,3,50,140,2,48,143,5,45,145,3,45,150,2,40,153,3,35,158,2,20,173,3,20,175,2,15,183,3,10,190,2,5,193,3,8,195,2,0,193,3,8,185,2,15,178,3,28,165,2,25,168,3,38,150,2,70,128] },
+  SEMI:                   { sw:  122, sh:  144, x:    0, y:    0, w:  122, h:  144, rows: [4,4,98,2,4,102,2,6,106,2,6,108,2,6,110,2,6,112,2,6,114,16,6,116,4,6,118,14,6,122,32,6,118,4,6,120,30,6,122,4,6,120,2,6,118,2,6,120,2,4,118,2,6,116,2,4,118,2,2,116,2,4,114,2,2,112,2,0,114,2,2,112,2,0,110,2,2,108] },
+  TRUCK:                  { sw:  100, sh:   78, x:    0, y:    0, w:  100, h:   78, rows: [2,23,75,2,21,78,2,21,92,3,21,94,2,19,95,3,19,97,6,18,97,1,16,97,2,16,95,2,16,94,1,14,95,4,7,95,2,0,95,1,2,95,2,2,97,4,0,97,15,0,99,2,2,99,2,4,99,5,6,99,2,6,100,1,6,99,2,6,100,2,6,99,2,0,100,1,2,99,2,0,97,2,2,95,1,0,94] },
+  CAR03:                  { sw:   88, sh:   55, x:    0, y:    0, w:   88, h:   55, rows: [3,31,75,1,31,76,3,31,77,1,31,78,1,31,80,1,27,86,3,26,87,1,27,86,1,26,85,2,23,86,1,19,86,1,16,87,1,11,87,3,7,88,4,4,88,7,3,88,1,4,88,2,3,88,2,4,88,5,3,88,1,4,88,2,6,88,1,8,87,1,9,88,1,9,87,2,7,86,1,3,85,1,2,86,1,0,85] },
+  CAR02:                  { sw:   80, sh:   59, x:    0, y:    0, w:   80, h:   59, rows: [2,29,54,1,27,57,1,23,60,2,20,62,1,19,63,1,18,66,2,18,67,1,16,67,1,16,69,3,15,69,1,15,73,2,15,74,2,14,74,1,14,77,2,14,78,1,14,79,3,11,80,1,10,80,1,7,80,2,6,80,1,4,80,5,3,80,8,3,79,1,3,77,2,3,75,1,2,77,1,2,75,2,2,77,1,3,75,1,4,74,2,4,75,1,3,74,1,2,73,1,0,69] },
+  CAR04:                  { sw:   80, sh:   57, x:    0, y:    0, w:   80, h:   57, rows: [2,27,61,1,25,64,1,23,65,2,22,67,2,21,68,1,20,69,5,14,77,2,16,75,1,17,73,1,16,75,3,14,77,1,13,77,1,11,77,2,9,78,1,8,78,2,6,79,13,4,79,3,4,78,11,6,78,1,0,79,1,2,80] },
+  CAR01:                  { sw:   80, sh:   56, x:    0, y:    0, w:   80, h:   56, rows: [2,25,62,1,23,64,1,22,64,1,20,67,2,18,67,1,17,68,1,17,69,1,15,69,2,14,70,1,13,72,2,12,74,2,12,77,1,10,78,2,8,78,2,5,79,2,4,80,19,3,80,1,5,80,9,5,79,1,3,79,1,2,79,1,0,80] },
+  PLAYER_UPHILL_LEFT:     { sw:   80, sh:   45, x:    0, y:    0, w:   80, h:   45, rows: [1,27,31,1,26,55,1,7,69,2,6,71,1,7,69,2,17,59,2,16,60,1,14,62,1,13,64,1,12,65,1,11,67,1,10,69,1,9,70,1,8,72,1,7,73,1,7,74,1,6,75,1,6,76,1,5,77,2,5,78,3,4,79,2,4,80,1,3,80,1,2,80,1,3,80,1,2,80,1,3,80,1,2,80,1,1,80,1,2,80,1,1,80,1,0,80,1,1,80,1,0,80,1,1,79,1,0,80,1,1,79,1,2,80] },
+  PLAYER_UPHILL_STRAIGHT: { sw:   80, sh:   45, x:    0, y:    0, w:   80, h:   45, rows: [1,26,30,1,25,54,1,9,71,2,8,72,1,9,71,2,19,61,1,18,62,1,18,63,1,16,64,1,14,65,1,13,66,1,12,67,1,11,68,1,10,69,1,9,70,1,8,71,1,7,72,1,6,73,1,5,74,1,4,75,1,4,76,2,3,77,10,2,78,4,1,79,1,2,79,1,0,80,1,1,79,1,0,80,1,1,79,1,0,80] },
+  PLAYER_UPHILL_RIGHT:    { sw:   80, sh:   45, x:    0, y:    0, w:   80, h:   45, rows: [1,24,28,1,23,52,1,11,73,2,9,75,1,11,73,2,21,63,2,20,64,1,18,66,1,16,67,1,14,68,1,13,69,1,11,70,1,10,70,1,8,71,1,7,72,1,6,73,1,5,74,1,4,74,1,3,75,2,2,75,3,1,76,1,0,76,1,0,77,4,0,76,1,0,77,1,0,78,1,0,77,1,0,78,1,0,79,1,0,78,1,0,79,1,0,80,1,1,79,1,0,80,1,1,79,1,0,78] },
+  PLAYER_LEFT:            { sw:   80, sh:   41, x:    0, y:    0, w:   80, h:   41, rows: [1,28,32,1,19,56,1,18,57,1,7,67,2,5,69,1,7,67,1,14,60,2,13,61,1,12,62,1,11,64,1,9,66,1,7,68,1,5,72,1,5,75,1,4,77,1,4,79,15,3,80,2,4,79,4,4,80,1,1,80,1,0,79] },
+  PLAYER_STRAIGHT:        { sw:   80, sh:   41, x:    0, y:    0, w:   80, h:   41, rows: [1,26,30,1,22,58,1,21,59,1,10,70,2,8,72,1,10,70,1,17,63,2,16,64,1,15,65,1,14,67,1,12,69,1,10,71,1,6,74,1,4,76,2,2,78,15,1,79,6,2,78,1,0,79,1,1,80] },
+  PLAYER_RIGHT:           { sw:   80, sh:   41, x:    0, y:    0, w:   80, h:   41, rows: [1,24,28,1,23,61,1,23,62,1,13,73,2,11,75,1,13,73,1,20,66,1,19,67,1,18,67,1,17,68,1,16,69,1,14,71,1,11,73,1,7,74,1,4,75,1,2,76,2,1,77,14,0,77,2,1,76,4,0,76,1,0,79,1,1,80] }
+};
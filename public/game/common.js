@@ -75,6 +75,28 @@ var Util = {
     var min2 = x2 - (w2*half);
     var max2 = x2 + (w2*half);
     return ! ((max1 < min2) || (min1 > max2));
+  },
+
+  spriteSpan: function(sprite, rows) { // opaque [left, right) columns of the bottom rows of a sprite (all rows if omitted)
+    var b = sprite.bounds;
+    if (!b)
+      return [0, sprite.w];
+    rows = Math.min(rows || sprite.h, sprite.h);
+    var span = b.spans[rows];
+    if (!span) {
+      var first = sprite.h - rows - b.y; // first row of the box that is inside the bottom rows
+      var left = sprite.w, right = 0, row = 0, n, count;
+      for(n = 0 ; n < b.rows.length ; n += 3) {
+        count = b.rows[n];
+        if ((row + count > first) && (b.rows[n+2] > 0)) {
+          left  = Math.min(left,  b.rows[n+1]);
+          right = Math.max(right, b.rows[n+2]);
+        }
+        row += count;
+      }
+      span = b.spans[rows] = (right > 0) ? [left, right] : [0, 0];
+    }
+    return span;
   }
 
 }
@@ -286,7 +308,7 @@ var Render = {
 
     var sourceX = layer.x + Math.floor(layer.w * rotation);
     var sourceY = layer.y
-    var sourceW = Math.min(imageW, layer.x+layer.w-sourceX);
+    var sourceW = layer.wrap ? imageW : Math.min(imageW, layer.x+layer.w-sourceX); // pre-wrapped strips never need the second blit
     var sourceH = imageH;
     
     var destX = 0;
@@ -310,9 +332,19 @@ var Render = {
     destX = destX + (destW * (offsetX || 0));
     destY = destY + (destH * (offsetY || 0));
 
+    var sourceX = sprite.x, sourceY = sprite.y, sourceW = sprite.w, sourceH = sprite.h;
+    if (sprite.bounds) { // only draw the opaque box, skipping transparent padding
+      var b = sprite.bounds, k = destW/sprite.w;
+      sourceX += b.x; sourceY += b.y; sourceW = b.w; sourceH = b.h;
+      destX   += b.x * k;
+      destY   += b.y * k;
+      destW    = b.w * k;
+      destH    = b.h * k;
+    }
+
     var clipH = clipY ? Math.max(0, destY+destH-clipY) : 0;
     if (clipH < destH)
-      ctx.drawImage(sprites, sprite.x, sprite.y, sprite.w, sprite.h - (sprite.h*clipH/destH), destX, destY, destW, destH - clipH);
+      ctx.drawImage(sprites, sourceX, sourceY, sourceW, sourceH - (sourceH*clipH/destH), destX, destY, destW, destH - clipH);
 
   },
 
@@ -422,3 +454,12 @@ SPRITES.BILLBOARDS = [SPRITES.BILLBOARD01, SPRITES.BILLBOARD02, SPRITES.BILLBOAR
 SPRITES.PLANTS     = [SPRITES.TREE1, SPRITES.TREE2, SPRITES.DEAD_TREE1, SPRITES.DEAD_TREE2, SPRITES.PALM_TREE, SPRITES.BUSH1, SPRITES.BUSH2, SPRITES.CACTUS, SPRITES.STUMP, SPRITES.BOULDER1, SPRITES.BOULDER2, SPRITES.BOULDER3];
 SPRITES.CARS       = [SPRITES.CAR01, SPRITES.CAR02, SPRITES.CAR03, SPRITES.CAR04, SPRITES.SEMI, SPRITES.TRUCK];
 
+if (typeof SPRITE_BOUNDS !== 'undefined') { // generated by tools/sprite_bounds.py, ignored for sprites that changed size since
+  for(var boundsName in SPRITE_BOUNDS) {
+    if (SPRITES[boundsName] && (SPRITES[boundsName].w == SPRITE_BOUNDS[boundsName].sw) && (SPRITES[boundsName].h == SPRITE_BOUNDS[boundsName].sh)) {
+      SPRITES[boundsName].bounds = SPRITE_BOUNDS[boundsName];
+      SPRITES[boundsName].bounds.spans = {};
+    }
+  }
+}
+
@@ -7,6 +7,12 @@ Creates a pixel-art style frame around the content
 from PIL import Image, ImageDraw
 import os
 
+from billboard_batch import (BillboardJob, batch_options, build_spritesheets, parse_batch_args,
+                             sheets_written)
+from profiling import profiled
+from resize_cache import cached_resize
+from sheet_output import registered_spritesheets
+
 def create_pixel_art_frame(width, height, frame_color=(180, 160, 120, 255), frame_thickness=6):
     """Create a pixel-art style billboard frame"""
     # Create frame image
@@ -48,6 +54,7 @@ def create_pixel_art_frame(width, height, frame_color=(180, 160, 120, 255), fram
     
     return frame
 
+@profiled
 def create_billboard_with_frame(content_img, width, height):
     """Create a billboard by adding frame around content"""
     # Resize content to fit inside frame
@@ -56,88 +63,46 @@ def create_billboard_with_frame(content_img, width, height):
     content_h = height - (frame_thickness * 2)
     
     # Resize content
-    content_resized = content_img.resize((content_w, content_h), Image.Resampling.LANCZOS)
-    
-    # Create frame
-    frame = create_pixel_art_frame(width, height)
-    
-    # Create final billboard
-    result = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    content_resized = cached_resize(content_img, (content_w, content_h), 'framed')
     
-    # Paste frame
-    result = Image.alpha_composite(result, frame)
+    # Create frame; it is a fresh image, so the billboard is built on it directly
+    result = create_pixel_art_frame(width, height)
     
-    # Paste content in center
+    # Composite content in center
     x_offset = frame_thickness
     y_offset = frame_thickness
-    result.paste(content_resized, (x_offset, y_offset), content_resized)
+    result.alpha_composite(content_resized, (x_offset, y_offset))
     
     return result
 
 def main():
+    args = parse_batch_args(__doc__)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     
-    # Map images to billboards with their dimensions
+    # Map images to billboards (dimensions come from the SPRITES table)
     mappings = [
-        ('invopay.png', 'BILLBOARD06', 298, 190),
-        ('faucet.png', 'BILLBOARD07', 298, 190),
-        ('arc.png', 'BILLBOARD09', 328, 282)
+        ('invopay.png', 'BILLBOARD06'),
+        ('faucet.png', 'BILLBOARD07'),
+        ('arc.png', 'BILLBOARD09')
     ]
     
-    spritesheet_paths = [
-        os.path.join(project_root, 'game', 'assets', 'sprites.png'),
-        os.path.join(project_root, 'public', 'game', 'assets', 'images', 'sprites.png')
-    ]
+    spritesheet_paths = registered_spritesheets(project_root)
     
-    # Billboard positions
-    positions = {
-        'BILLBOARD06': (488, 555),
-        'BILLBOARD07': (313, 897),
-        'BILLBOARD09': (150, 555)
-    }
-    
-    # Process each spritesheet
-    for spritesheet_path in spritesheet_paths:
-        if not os.path.exists(spritesheet_path):
-            print(f"Warning: {spritesheet_path} not found, skipping")
-            continue
+    jobs = []
+    for image_file, billboard_name in mappings:
+        image_path = os.path.join(script_dir, image_file)
         
-        print(f"\n{'='*60}")
-        print(f"Processing: {os.path.basename(spritesheet_path)}")
-        print(f"{'='*60}")
-        
-        # Open spritesheet
-        spritesheet = Image.open(spritesheet_path).convert('RGBA')
-        
-        for image_file, billboard_name, w, h in mappings:
-            image_path = os.path.join(script_dir, image_file)
-            
-            if not os.path.exists(image_path):
-                print(f"Error: Image not found: {image_path}")
-                continue
-            
-            # Load new content
-            new_content = Image.open(image_path).convert('RGBA')
-            
-            # Get billboard position
-            x, y = positions[billboard_name]
-            
-            print(f"\nProcessing {billboard_name}:")
-            print(f"  Content size: {new_content.size}")
-            print(f"  Target size: {w}x{h}")
-            
-            # Create billboard with frame
-            billboard_with_frame = create_billboard_with_frame(new_content, w, h)
-            
-            # Paste into spritesheet
-            spritesheet.paste(billboard_with_frame, (x, y), billboard_with_frame)
-            
-            print(f"  ✓ Updated {billboard_name} with frame")
+        if not os.path.exists(image_path):
+            print(f"Error: Image not found: {image_path}")
+            continue
         
-        # Save spritesheet
-        spritesheet.save(spritesheet_path)
-        print(f"\n✓ Saved {spritesheet_path}")
+        jobs.append(BillboardJob(image_path, billboard_name, 'framed'))
+    
+    # Render each framed billboard once, then update every spritesheet
+    # with a single decode/encode
+    if not sheets_written(build_spritesheets(spritesheet_paths, jobs, **batch_options(args))):
+        return
     
     print("\n" + "="*60)
     print("✓ All billboards updated with pixel-art frames!")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Insert new sprites into the existing atlas without repacking it
+Keeps a persistent index of the free (fully transparent, unregistered) space
+of sprites.png as maximal rectangles and places every new sprite from
+game/assets/sprites/ in the best-fitting one. Existing sprites keep their
+coordinates, so the SPRITES table only gains entries and cached copies of
+the sheet stay valid for everything already in it
+Usage: python atlas_insert.py [NAME ...] [--padding N] [--no-trim] [--grow] [--output-dir DIR | --apply]
+"""
+
+from PIL import Image
+import argparse
+import json
+import os
+import numpy as np
+
+from compositing import buffer_image, composite_over, decode_rgba
+from pack_atlas import DEFAULT_PADDING, SPRITES_DIR, _split_free, sprite_name, trim
+from profiling import profiled
+from resize_cache import CACHE_DIR
+from sheet_output import atomic_write, file_hash, registered_spritesheets, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import PROJECT_ROOT, format_table, sprite_table, write_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'packed')
+INDEX_PATH = os.path.join(CACHE_DIR, 'free_rects.json')
+
+# Opaque pixels outside every registered sprite are blocked out in cells of
+# this size, so stray pixels don't fragment the index into slivers
+CELL = 8
+
+def stray_rects(alpha, table, cell=CELL):
+    """Rectangles covering the opaque pixels that belong to no sprite
+
+    Marks the cells holding such pixels and merges each row of cells into
+    runs, all vectorized. Returns [(x, y, w, h)].
+    """
+    height, width = alpha.shape
+    registered = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in table.values():
+        registered[y:y + h, x:x + w] = True
+    stray = (alpha > 0) & ~registered
+    if not stray.any():
+        return []
+    rows, cols = -(-height // cell), -(-width // cell)
+    stray = np.pad(stray, ((0, rows * cell - height), (0, cols * cell - width)))
+    cells = stray.reshape(rows, cell, cols, cell).any(axis=(1, 3))
+    edges = np.diff(np.pad(cells, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return [(int(start) * cell, int(row) * cell,
+             min(int(end) * cell, width) - int(start) * cell, min(cell, height - int(row) * cell))
+            for row, start, end in zip(run_rows, starts, ends)]
+
+def free_rects(size, occupied, padding):
+    """Maximal free rectangles of a sheet, keeping padding around occupied rects and the border"""
+    width, height = size
+    free = [(padding, padding, width - 2 * padding, height - 2 * padding)]
+    for x, y, w, h in occupied:
+        free = _split_free(free, (x - padding, y - padding, w + 2 * padding, h + 2 * padding))
+    return free
+
+def best_fit(free, w, h):
+    """Top-left of the free rectangle that fits w x h with the shortest leftover side, or None"""
+    if not free:
+        return None
+    rects = np.array(free, dtype=np.int64)
+    fits = (rects[:, 2] >= w) & (rects[:, 3] >= h)
+    if not fits.any():
+        return None
+    rects = rects[fits]
+    short = np.minimum(rects[:, 2] - w, rects[:, 3] - h)
+    long = np.maximum(rects[:, 2] - w, rects[:, 3] - h)
+    best = np.lexsort((rects[:, 0], rects[:, 1], long, short))[0]
+    return int(rects[best, 0]), int(rects[best, 1])
+
+def load_index(sheet_hash, table, padding, path=INDEX_PATH):
+    """Free rectangles stored for this exact sheet, table and padding, or None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (index.get('sheet_hash') != sheet_hash or index.get('padding') != padding
+            or index.get('table') != {name: list(rect) for name, rect in table.items()}):
+        return None
+    return [tuple(rect) for rect in index['free']]
+
+def save_index(sheet_hash, table, padding, free, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index = {
+        'sheet_hash': sheet_hash,
+        'padding': padding,
+        'table': {name: list(rect) for name, rect in table.items()},
+        'free': [list(rect) for rect in free]
+    }
+    atomic_write(path, json.dumps(index).encode())
+
+@profiled
+def build_index(sheet, table, padding):
+    """Free rectangles of a (height, width, 4) sheet around its sprites and stray pixels"""
+    occupied = list(table.values()) + stray_rects(sheet[..., 3], table)
+    return free_rects((sheet.shape[1], sheet.shape[0]), occupied, padding)
+
+def load_new_sprites(names, table, sprites_dir=SPRITES_DIR, trim_borders=True):
+    """{name: image} of the requested sprites, or of every file not in the table yet"""
+    files = {sprite_name(f): os.path.join(sprites_dir, f)
+             for f in sorted(os.listdir(sprites_dir)) if f.lower().endswith('.png')}
+    names = [name.upper() for name in names] or [name for name in files if name not in table]
+    sprites = {}
+    for name in names:
+        if name in table:
+            print(f"Warning: {name} is already in the sheet at {table[name][:2]}, skipping")
+            continue
+        if name not in files:
+            print(f"Warning: no {name.lower()}.png in {os.path.relpath(sprites_dir, PROJECT_ROOT)}, skipping")
+            continue
+        image = Image.open(files[name]).convert('RGBA')
+        if trim_borders:
+            image, _ = trim(image)
+        sprites[name] = image
+    return sprites
+
+@profiled
+def insert_sprites(free, sprites, padding):
+    """Place sprites, largest first, and split the free rectangles around each
+
+    Returns ({name: (x, y, w, h)}, free, [names that didn't fit]).
+    """
+    placed = {}
+    failed = []
+    for name, image in sorted(sprites.items(), key=lambda item: -item[1].width * item[1].height):
+        position = best_fit(free, image.width, image.height)
+        if position is None:
+            failed.append(name)
+            continue
+        rect = (*position, image.width, image.height)
+        placed[name] = rect
+        x, y, w, h = rect
+        free = _split_free(free, (x - padding, y - padding, w + 2 * padding, h + 2 * padding))
+    return placed, free, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert new sprites into free space of the sheet")
+    parser.add_argument('names', nargs='*', help='sprites to insert, e.g. car05 (default: every file not in SPRITES)')
+    parser.add_argument('--sprites-dir', default=SPRITES_DIR, help='directory of individual sprite PNGs')
+    parser.add_argument('--padding', type=int, default=DEFAULT_PADDING, help='gap around sprites in pixels')
+    parser.add_argument('--no-trim', action='store_true', help='keep transparent borders')
+    parser.add_argument('--grow', action='store_true',
+                        help='add rows at the bottom of the sheet for sprites that fit nowhere')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help='where to write sprites.png and sprites.js for review')
+    parser.add_argument('--apply', action='store_true',
+                        help='write the sheet to every registered copy and add the sprites to every SPRITES table')
+    parser.add_argument('--optimize-png', action='store_true', help='search for the smallest PNG encoding')
+    args = parser.parse_args()
+
+    spritesheet_paths = [path for path in registered_spritesheets(PROJECT_ROOT) if os.path.exists(path)]
+    if not spritesheet_paths:
+        print("Error: no spritesheet found")
+        return
+    source_path = spritesheet_paths[0]
+    table = sprite_table()
+    sprites = load_new_sprites(args.names, table, args.sprites_dir, not args.no_trim)
+    if not sprites:
+        print("Nothing to insert")
+        return
+
+    sheet = decode_rgba(source_path)
+    sheet_hash = file_hash(source_path)
+    free = load_index(sheet_hash, table, args.padding)
+    if free is None:
+        free = build_index(sheet, table, args.padding)
+        save_index(sheet_hash, table, args.padding, free)
+        print(f"Indexed {len(free)} free rectangles in {sheet.shape[1]}x{sheet.shape[0]}")
+
+    placed, free, failed = insert_sprites(free, sprites, args.padding)
+    if failed and args.grow:
+        # New rows only extend the sheet, so every existing coordinate stays valid
+        extra = max(sprites[name].height for name in failed) + args.padding
+        grown = np.zeros((sheet.shape[0] + extra, sheet.shape[1], 4), dtype=np.uint8)
+        grown[:sheet.shape[0]] = sheet
+        sheet = grown
+        occupied = list(table.values()) + stray_rects(sheet[..., 3], table) + list(placed.values())
+        free = free_rects((sheet.shape[1], sheet.shape[0]), occupied, args.padding)
+        more, free, failed = insert_sprites(free, {name: sprites[name] for name in failed}, args.padding)
+        placed.update(more)
+        print(f"  ↕ Grew the sheet by {extra} rows to {sheet.shape[1]}x{sheet.shape[0]}")
+    for name in failed:
+        print(f"Error: {name} ({sprites[name].width}x{sprites[name].height}) doesn't fit; "
+              f"rerun with --grow or repack with pack_atlas.py")
+    if not placed:
+        return
+
+    for name, (x, y, w, h) in placed.items():
+        composite_over(sheet, np.asarray(sprites[name]), x, y)
+        print(f"  + {name}: {w}x{h} at ({x}, {y})")
+    entries = dict(table, **placed)
+    spritesheet = buffer_image(sheet)
+
+    if args.apply:
+        save_spritesheet(spritesheet, spritesheet_paths, args.optimize_png)
+        for path in write_table(entries):
+            print(f"  ✓ Updated SPRITES in {os.path.relpath(path, PROJECT_ROOT)}")
+        save_index(file_hash(source_path), entries, args.padding, free)
+        _, stale = write_bounds(sheet, entries)
+        if stale:
+            print(f"  ✓ Updated SPRITE_BOUNDS in {', '.join(stale)}")
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        save_spritesheet(spritesheet, [os.path.join(args.output_dir, 'sprites.png')], args.optimize_png)
+        table_path = os.path.join(args.output_dir, 'sprites.js')
+        atomic_write(table_path, (format_table('SPRITES', entries) + '\n').encode())
+        print(f"  ✓ Saved {table_path}")
+        print("\nReview the output, then rerun with --apply to update the game")
+
+    print(f"\nNew sprites are in the table but not in any group: {', '.join(placed)}")
+    print("  Add them to SPRITES.CARS/PLANTS/BILLBOARDS in game/common.js to use them in the game.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Resolution-tiered spritesheet variants for low-memory devices
+Downsamples the sheet in linear light with premultiplied alpha, so sprite
+edges don't pick up dark fringes, and writes sprites@0.5x.png etc. next to
+every copy with a sprites.tiers.json manifest of the scaled SPRITES tables
+Usage: python atlas_tiers.py [--tiers 0.5,0.25]
+"""
+
+from PIL import Image
+import argparse
+import json
+import math
+import os
+import numpy as np
+
+from profiling import profiled
+from sheet_output import fan_out, registered_spritesheets, save_spritesheet
+from sprite_registry import sprite_table
+
+DEFAULT_TIERS = (0.5, 0.25)
+
+def parse_tiers(value):
+    """Parse '0.5,0.25' into a tuple of scales between 0 and 1"""
+    tiers = tuple(float(part) for part in value.split(',') if part)
+    for scale in tiers:
+        if not 0 < scale < 1:
+            raise argparse.ArgumentTypeError(f"tier scale must be between 0 and 1, got {scale}")
+    return tiers
+
+def srgb_to_linear(values):
+    """sRGB 0-255 to linear light 0-1"""
+    c = values / 255.0
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(values):
+    """Linear light 0-1 to sRGB 0-255"""
+    c = np.clip(values, 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1 / 2.4) - 0.055) * 255.0
+
+def tier_size(size, scale):
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+@profiled
+def downsample(image, scale, resample=Image.Resampling.BOX):
+    """Gamma-correct, premultiplied-alpha downsample of an RGBA image"""
+    rgba = np.asarray(image.convert('RGBA'), dtype=np.float32)
+    alpha = rgba[..., 3] / 255.0
+    premultiplied = srgb_to_linear(rgba[..., :3]).astype(np.float32) * alpha[..., None]
+    size = tier_size(image.size, scale)
+
+    def resize(channel):
+        return np.asarray(Image.fromarray(np.ascontiguousarray(channel, dtype=np.float32), 'F').resize(size, resample))
+
+    out_alpha = np.clip(resize(alpha), 0.0, 1.0)
+    colour = np.stack([resize(premultiplied[..., i]) for i in range(3)], axis=-1)
+    safe_alpha = np.where(out_alpha > 0, out_alpha, 1.0)[..., None]
+    colour = np.where(out_alpha[..., None] > 0, colour / safe_alpha, 0.0)
+
+    result = np.empty((size[1], size[0], 4), dtype=np.uint8)
+    result[..., :3] = np.round(linear_to_srgb(colour))
+    result[..., 3] = np.round(out_alpha * 255.0)
+    return Image.fromarray(result, 'RGBA')
+
+def scale_rect(rect, scale, size):
+    """Tier rect covering every pixel the original rect touches"""
+    x, y, w, h = rect
+    left, top = math.floor(x * scale), math.floor(y * scale)
+    right = min(size[0], math.ceil((x + w) * scale))
+    bottom = min(size[1], math.ceil((y + h) * scale))
+    return (left, top, right - left, bottom - top)
+
+def tier_name(png_path, scale):
+    """sprites.png -> sprites@0.5x.png"""
+    stem, extension = os.path.splitext(png_path)
+    return f"{stem}@{scale:g}x{extension}"
+
+def tiers_manifest_path(png_path):
+    return f"{os.path.splitext(png_path)[0]}.tiers.json"
+
+def tier_paths(png_paths, tiers):
+    """Every file a tiered export writes for the given PNG copies"""
+    if not tiers:
+        return []
+    return [path for png_path in png_paths
+            for path in [tier_name(png_path, scale) for scale in tiers] + [tiers_manifest_path(png_path)]]
+
+def export_tiers(spritesheet, png_paths, tiers=DEFAULT_TIERS, table=None, **save_options):
+    """Write every tier next to each PNG copy, plus the tiers manifest
+
+    The manifest lists, per tier, the file, its size and the SPRITES rects in
+    tier pixels. Sprite sizes for layout stay the 1x values; tier rects are
+    only the drawImage source. save_options go to save_spritesheet.
+    Returns (written, skipped).
+    """
+    if table is None:
+        table = sprite_table()
+    written = []
+    skipped = []
+    entries = [{
+        'scale': 1,
+        'file': None,
+        'width': spritesheet.width,
+        'height': spritesheet.height,
+        'sprites': {name: list(rect) for name, rect in table.items()}
+    }]
+    for scale in sorted(tiers, reverse=True):
+        tier = downsample(spritesheet, scale)
+        print(f"  Tier {scale:g}x: {tier.width}x{tier.height}")
+        result = save_spritesheet(tier, [tier_name(path, scale) for path in png_paths], **save_options)
+        written += result[0]
+        skipped += result[1]
+        entries.append({
+            'scale': scale,
+            'file': None,
+            'width': tier.width,
+            'height': tier.height,
+            'sprites': {name: list(scale_rect(rect, scale, tier.size)) for name, rect in table.items()}
+        })
+
+    # Copies that share a file name share a manifest
+    for png_name in sorted({os.path.basename(path) for path in png_paths}):
+        copies = [path for path in png_paths if os.path.basename(path) == png_name]
+        for entry in entries:
+            entry['file'] = png_name if entry['scale'] == 1 else os.path.basename(tier_name(png_name, entry['scale']))
+        manifest = json.dumps({'tiers': entries}, indent=2).encode()
+        result = fan_out(manifest, [tiers_manifest_path(path) for path in copies])
+        written += result[0]
+        skipped += result[1]
+    return written, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="Write downscaled spritesheet tiers from the current sheet")
+    parser.add_argument('--tiers', type=parse_tiers, default=DEFAULT_TIERS, metavar='LIST',
+                        help='comma-separated scales (default 0.5,0.25)')
+    args = parser.parse_args()
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    png_paths = [path for path in registered_spritesheets(project_root) if os.path.exists(path)]
+    if not png_paths:
+        print("Error: no spritesheet found")
+        return
+    spritesheet = Image.open(png_paths[0]).convert('RGBA')
+    export_tiers(spritesheet, png_paths, args.tiers)
+
+if __name__ == "__main__":
+    main()
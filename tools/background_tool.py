@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Background layer pipeline for game/assets/background.png
+Reads the BACKGROUND table, writes the atlas at 8 bits per channel (optionally
+palettized), and can pre-wrap each parallax layer into a strip with an overlap
+margin so Render.background needs one drawImage per layer instead of two
+Usage: python background_tool.py [--wrap] [--optimize-png [--max-error E]] [--output-dir DIR | --apply]
+"""
+
+from PIL import Image
+import argparse
+import math
+import os
+import numpy as np
+
+from sheet_output import atomic_write, save_spritesheet
+from sprite_registry import format_table, sprite_table, write_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'packed')
+
+# Every copy of the background atlas the game and the site serve
+BACKGROUND_DESTINATIONS = [
+    os.path.join('game', 'assets', 'background.png'),
+    os.path.join('public', 'game', 'assets', 'background.png'),
+    os.path.join('public', 'game', 'assets', 'images', 'background.png')
+]
+
+# Every copy of the BACKGROUND table
+BACKGROUND_TABLE_DESTINATIONS = [
+    os.path.join('game', 'common.js'),
+    os.path.join('game', 'assets', 'background.js'),
+    os.path.join('public', 'game', 'common.js'),
+    os.path.join('public', 'game', 'assets', 'background.js')
+]
+
+# Margin around every layer (so layers are 2 * PADDING apart), as in the original atlas
+PADDING = 5
+
+# The IHDR chunk follows the signature; its bit depth byte is at offset 24
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_IHDR_END = 29
+
+def registered_backgrounds(project_root=PROJECT_ROOT):
+    return [os.path.join(project_root, destination) for destination in BACKGROUND_DESTINATIONS]
+
+def png_bit_depth(path):
+    """Bits per sample from a PNG's IHDR chunk, or None if path isn't a PNG"""
+    with open(path, 'rb') as f:
+        header = f.read(PNG_IHDR_END)
+    if len(header) < PNG_IHDR_END or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    return header[24]
+
+def load_background(path):
+    """Decode the atlas to 8-bit RGBA; returns (image, bits per sample of the file)
+
+    Pillow reduces 16-bit PNGs to the high byte of every sample, which is all
+    the canvas keeps anyway.
+    """
+    bits = png_bit_depth(path) or 8
+    with Image.open(path) as image:
+        return image.convert('RGBA'), bits
+
+def wrap_margin(layer_width):
+    """Columns Render.background can read past the end of a layer: half its width"""
+    return math.ceil(layer_width / 2)
+
+def wrap_layers(atlas, table, padding=PADDING):
+    """Stack every layer as a pre-wrapped strip
+
+    Each strip is the layer followed by its first wrap_margin() columns, so
+    any rotation is a single contiguous source rectangle. Returns
+    (atlas, {name: (x, y, w, h)}, {name: {'wrap': margin}}); w stays the
+    period of the layer.
+    """
+    margins = {name: wrap_margin(w) for name, (x, y, w, h) in table.items()}
+    width = max(w + margins[name] for name, (x, y, w, h) in table.items()) + 2 * padding
+    height = sum(h + 2 * padding for _, _, _, h in table.values())
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    source = np.asarray(atlas)
+    entries = {}
+    top = padding
+    for name, (x, y, w, h) in table.items():
+        layer = source[y:y + h, x:x + w]
+        pixels[top:top + h, padding:padding + w] = layer
+        pixels[top:top + h, padding + w:padding + w + margins[name]] = layer[:, :margins[name]]
+        entries[name] = (padding, top, w, h)
+        top += h + 2 * padding
+    extra = {name: {'wrap': margin} for name, margin in margins.items()}
+    return Image.fromarray(pixels, 'RGBA'), entries, extra
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the background atlas at 8 bits, optionally pre-wrapped")
+    parser.add_argument('--wrap', action='store_true',
+                        help='pre-wrap every layer so it is drawn with a single drawImage')
+    parser.add_argument('--optimize-png', action='store_true',
+                        help='search for the smallest PNG, including a lossless palette')
+    parser.add_argument('--max-error', type=float, metavar='E',
+                        help='with --optimize-png, allow a quantized palette up to this RMS error')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help='where to write background.png and background.js for review')
+    parser.add_argument('--apply', action='store_true',
+                        help='write the atlas to every registered copy and rewrite every BACKGROUND table')
+    args = parser.parse_args()
+
+    destinations = [path for path in registered_backgrounds() if os.path.exists(path)]
+    if not destinations:
+        print("Error: no background.png found")
+        return
+    table = sprite_table('BACKGROUND')
+    if not table:
+        print("Error: no BACKGROUND table found")
+        return
+
+    atlas, bits = load_background(destinations[0])
+    print(f"Source: {os.path.relpath(destinations[0], PROJECT_ROOT)} "
+          f"({atlas.width}x{atlas.height}, {bits}-bit, {os.path.getsize(destinations[0])} bytes)")
+    extra = None
+    if args.wrap:
+        atlas, table, extra = wrap_layers(atlas, table)
+        for name, (x, y, w, h) in table.items():
+            print(f"  ↻ {name}: {w}x{h} + {extra[name]['wrap']} px wrap margin at ({x}, {y})")
+
+    if args.apply:
+        save_spritesheet(atlas, destinations, args.optimize_png, args.max_error)
+        if extra:
+            written = write_table(table, 'BACKGROUND', destinations=BACKGROUND_TABLE_DESTINATIONS, extra=extra)
+            for path in written:
+                print(f"  ✓ Updated BACKGROUND in {os.path.relpath(path, PROJECT_ROOT)}")
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        png_path = os.path.join(args.output_dir, 'background.png')
+        save_spritesheet(atlas, [png_path], args.optimize_png, args.max_error)
+        table_path = os.path.join(args.output_dir, 'background.js')
+        atomic_write(table_path, (format_table('BACKGROUND', table, extra) + '\n').encode())
+        print(f"  ✓ Saved {table_path}")
+        print(f"  {os.path.getsize(destinations[0])} → {os.path.getsize(png_path)} bytes")
+        print("\nReview the output, then rerun with --apply to update the game")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Benchmark the spritesheet tooling on synthetic atlases
+Generates sheets from 1k² to 8k² with N billboard jobs and times every stage
+(decode, convert, resize, frame build, alpha_composite, paste, PNG encode)
+Usage: python bench_billboards.py [--sizes 1024 2048 4096 8192] [--jobs N] [--repeat N]
+                                  [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Resizes go through the content cache; point it at a scratch directory so
+# runs start cold and the real cache is left alone
+SCRATCH_DIR = None
+if 'BILLBOARD_CACHE_DIR' not in os.environ:
+    SCRATCH_DIR = tempfile.mkdtemp(prefix='bench_billboards_')
+    os.environ['BILLBOARD_CACHE_DIR'] = SCRATCH_DIR
+
+from PIL import Image
+import numpy as np
+
+from add_billboard_frames import create_billboard_with_frame
+from billboard_batch import BILLBOARDS, composite_tiles
+from replace_billboards import resize_and_fit
+from resize_cache import RESIZE_CACHE_DIR
+from sheet_output import encode_png
+
+STAGES = ('decode', 'convert', 'resize', 'resize_cached', 'frame', 'alpha_composite', 'paste', 'encode')
+DEFAULT_SIZES = (1024, 2048, 4096, 8192)
+CONTENT_SIZE = (1024, 768)
+PADDING = 4
+
+def synthetic_sheet(size, rng):
+    """Sprite-like RGBA atlas: opaque blocks with soft edges on a transparent field"""
+    sheet = np.zeros((size, size, 4), dtype=np.uint8)
+    cell = 64
+    for y in range(0, size, cell):
+        for x in range(0, size, cell):
+            if rng.random() < 0.35:
+                continue
+            w, h = rng.integers(16, cell, size=2)
+            sheet[y:y + h, x:x + w, :3] = rng.integers(0, 256, size=3)
+            sheet[y:y + h, x:x + w, 3] = 255
+            # Anti-aliased rim, as on the real sprites
+            sheet[y:y + h, x, 3] = 128
+    return Image.fromarray(sheet, 'RGBA')
+
+def synthetic_content(index, rng):
+    """Sponsor-art stand-in: gradient background with a few solid shapes"""
+    w, h = CONTENT_SIZE
+    gx = np.linspace(0, 255, w, dtype=np.float32)
+    gy = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+    pixels = np.empty((h, w, 4), dtype=np.uint8)
+    pixels[..., 0] = (gx + gy) / 2
+    pixels[..., 1] = np.broadcast_to(gy, (h, w))
+    pixels[..., 2] = (index * 37) % 256
+    pixels[..., 3] = 255
+    for _ in range(6):
+        x0, y0 = rng.integers(0, w // 2), rng.integers(0, h // 2)
+        pixels[y0:y0 + h // 4, x0:x0 + w // 4, :3] = rng.integers(0, 256, size=3)
+    image = Image.fromarray(pixels, 'RGBA')
+    image.info['source_hash'] = f"bench-content-{index}"
+    return image
+
+def billboard_slots(size, count):
+    """Lay out count billboard rects row by row, cycling through the real billboard sizes"""
+    sizes = [(w, h) for _, _, w, h in BILLBOARDS.values()]
+    slots = []
+    x = y = row_height = 0
+    for i in range(count):
+        w, h = sizes[i % len(sizes)]
+        if x + w > size:
+            x, y, row_height = 0, y + row_height + PADDING, 0
+        if y + h > size:
+            # Sheet is full, wrap around and overlap earlier slots
+            x = y = row_height = 0
+        slots.append((x, y, w, h))
+        x += w + PADDING
+        row_height = max(row_height, h)
+    return slots
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB
+
+    This is a high-water mark over the whole process, so it is only reported
+    per size, where every size runs in its own worker (see run).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def time_stage(fn, repeat, setup=None):
+    """Best and mean wall time of fn over repeat runs; returns (stats, last result)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {'best_s': min(times), 'mean_s': sum(times) / len(times)}, result
+
+def clear_resize_cache():
+    shutil.rmtree(RESIZE_CACHE_DIR, ignore_errors=True)
+
+def bench_size(size, job_count, repeat, seed):
+    """Time every stage on one synthetic sheet size"""
+    rng = np.random.default_rng(seed)
+    png = encode_png(synthetic_sheet(size, rng))
+    contents = [synthetic_content(i, rng) for i in range(job_count)]
+    slots = billboard_slots(size, job_count)
+    jobs = list(zip(contents, slots))
+    stages = {}
+
+    def decode():
+        image = Image.open(io.BytesIO(png))
+        image.load()
+        return image
+    stages['decode'], decoded = time_stage(decode, repeat)
+    stages['convert'], sheet = time_stage(lambda: decoded.convert('RGBA'), repeat)
+
+    def resize_all():
+        return [resize_and_fit(content, w, h) for content, (x, y, w, h) in jobs]
+    stages['resize'], _ = time_stage(resize_all, repeat, setup=clear_resize_cache)
+    stages['resize_cached'], _ = time_stage(resize_all, repeat)
+
+    def frame_all():
+        return [(x, y, create_billboard_with_frame(content, w, h)) for content, (x, y, w, h) in jobs]
+    stages['frame'], tiles = time_stage(frame_all, repeat, setup=clear_resize_cache)
+
+    def alpha_composite_all():
+        for x, y, tile in tiles:
+            sheet.alpha_composite(tile, (x, y))
+    stages['alpha_composite'], _ = time_stage(alpha_composite_all, repeat)
+    buffer = np.array(sheet)
+    stages['paste'], _ = time_stage(lambda: composite_tiles(buffer, tiles), repeat)
+    stages['encode'], encoded = time_stage(lambda: encode_png(sheet), repeat)
+
+    return {
+        'size': size,
+        'jobs': job_count,
+        'pixels': size * size,
+        'encoded_bytes': len(encoded),
+        'stages': stages,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def run(sizes, job_count, repeat, seed):
+    """Benchmark every size in a fresh worker process so peak RSS is per size"""
+    results = []
+    for size in sizes:
+        print(f"Benchmarking {size}x{size} with {job_count} billboard jobs...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(executor.submit(bench_size, size, job_count, repeat, seed).result())
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pillow': Image.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'results': results
+    }
+
+def print_report(report):
+    header = f"{'stage':<16}" + ''.join(f"{result['size']:>10}²" for result in report['results'])
+    print(header)
+    print('-' * len(header))
+    for stage in STAGES:
+        row = f"{stage:<16}"
+        for result in report['results']:
+            row += f"{result['stages'][stage]['best_s'] * 1000:>9.1f}ms"
+        print(row)
+    print(f"{'peak RSS':<16}" + ''.join(f"{result['peak_rss_mb']:>9.0f}MB" for result in report['results']))
+
+def compare(report, baseline, threshold):
+    """Stages that got slower than baseline by more than threshold (a fraction)"""
+    previous = {(result['size'], result['jobs']): result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        base = previous.get((result['size'], result['jobs']))
+        if base is None:
+            continue
+        for stage in STAGES:
+            old = base['stages'].get(stage, {}).get('best_s')
+            new = result['stages'][stage]['best_s']
+            if old and new > old * (1 + threshold):
+                regressions.append((result['size'], stage, old, new))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the spritesheet tooling on synthetic atlases")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), metavar='PX',
+                        help='square sheet sizes to generate')
+    parser.add_argument('--jobs', type=int, default=16, metavar='N', help='billboard jobs per sheet')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage (best and mean are reported)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic content')
+    parser.add_argument('--output', '-o', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='baseline JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown fraction counted as a regression (default 0.2)')
+    args = parser.parse_args()
+
+    try:
+        report = run(args.sizes, args.jobs, args.repeat, args.seed)
+    finally:
+        if SCRATCH_DIR is not None:
+            shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Saved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\nRegressions (> {args.threshold:.0%} slower):")
+            for size, stage, old, new in regressions:
+                print(f"  {size}² {stage}: {old * 1000:.1f}ms → {new * 1000:.1f}ms")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+if __name__ == "__main__":
+    main()
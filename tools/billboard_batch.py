@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Batch billboard compositing engine
+Renders every (image, billboard, mode) job once, then decodes the spritesheet
+once into an RGBA buffer, composites every tile over it in place and encodes
+the result once for every copy
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import argparse
+from PIL import Image
+import io
+import os
+
+from atlas_tiers import export_tiers, parse_tiers, tier_paths
+from build_state import (dirty_jobs, job_fingerprint, load_state, region_hashes,
+                         save_state, sheet_key, write_report)
+from compositing import buffer_image, composite_over, decode_rgba
+import profiling
+from profiling import count, profiled, span
+from raw_atlas import open_atlas, same_file
+from resize_cache import cached_resize, open_hashed
+from sheet_output import available_formats, export_paths, file_hash, registered_spritesheets, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import PROJECT_ROOT, sprite_group
+
+# Billboard positions and dimensions, from the game's SPRITES table
+BILLBOARDS = sprite_group('BILLBOARDS')
+
+# How each mode renders a tile:
+#   stretch               - resize content to the billboard size (integrate_billboards)
+#   letterbox             - keep aspect ratio and center (replace_billboards)
+#   cover                 - keep aspect ratio, fill the billboard and crop the overflow
+#   framed                - draw a pixel-art frame around content (add_billboard_frames)
+#   edge-frame            - overlay the edges of a reference billboard (replace_billboards_with_frame)
+#   original-frame        - paste content over a reference billboard (fix_billboards_with_frames)
+#   framed-from-reference - insert content inside a reference frame (insert_images_into_billboards)
+#   masked                - fit and clip content to the segmented panel of a reference (panel_mask)
+# build_spritesheets result with raw_atlas=True: the raw atlas holds the new
+# tiles, but the sheets are only written by 'python raw_atlas.py export'
+EXPORT_PENDING = 'export pending'
+
+MODES = ('stretch', 'letterbox', 'cover', 'framed', 'edge-frame', 'original-frame', 'framed-from-reference',
+         'masked')
+REFERENCE_MODES = ('edge-frame', 'original-frame', 'framed-from-reference', 'masked')
+
+# image and reference may be file paths or PIL images
+BillboardJob = namedtuple('BillboardJob', ['image', 'billboard', 'mode', 'reference'], defaults=[None])
+
+def add_output_arguments(parser):
+    """Add the options that control how the sheet is written to a parser"""
+    parser.add_argument('--optimize-png', action='store_true',
+                        help='search PNG filters and zlib settings for the smallest sheet')
+    parser.add_argument('--max-error', type=float, metavar='E',
+                        help='with --optimize-png, allow a quantized palette up to this RMS error')
+    parser.add_argument('--formats', type=lambda value: [name for name in value.split(',') if name],
+                        default=[], metavar='LIST',
+                        help='also export these formats next to the PNG, e.g. webp,avif')
+    parser.add_argument('--tiers', type=parse_tiers, default=(), metavar='LIST',
+                        help='also write downscaled sheets, e.g. 0.5,0.25, with scaled SPRITES tables')
+    return parser
+
+def add_batch_arguments(parser):
+    """Add the options shared by the batch billboard scripts to a parser"""
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-render billboards whose inputs changed, skip the run if none did')
+    parser.add_argument('--changed-report', metavar='PATH',
+                        help='write the changed billboard regions as JSON for the deploy step')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='render billboard tiles on N worker processes')
+    add_output_arguments(parser)
+    parser.add_argument('--raw-atlas', action='store_true',
+                        help='edit a memory-mapped raw copy of the sheet kept in the cache; write it with raw_atlas.py export')
+    parser.add_argument('--profile', action='store_true',
+                        help='print per-stage timings at the end of the run (or set BILLBOARD_PROFILE=1)')
+    parser.add_argument('--profile-trace', metavar='PATH',
+                        help='also write the timings as a Chrome trace JSON')
+    return parser
+
+def parse_batch_args(description=None, argv=None):
+    """Parse the options shared by the batch billboard scripts"""
+    parser = argparse.ArgumentParser(description=description)
+    add_batch_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.configure(args.profile, args.profile_trace)
+    return args
+
+def batch_options(args):
+    """build_spritesheets keyword arguments from parsed batch options"""
+    return {
+        'incremental': args.incremental,
+        'report_path': args.changed_report,
+        'workers': args.jobs,
+        'optimize_png': args.optimize_png,
+        'max_error': args.max_error,
+        'formats': args.formats,
+        'tiers': args.tiers,
+        'raw_atlas': args.raw_atlas
+    }
+
+def load_rgba(source, cache, target=None):
+    """Open an image as RGBA, decoding each path only once per batch and target
+
+    target is the tile size the image is rendered into; oversized sources
+    are shrunk while decoding (see resize_cache.open_hashed).
+    """
+    if isinstance(source, Image.Image):
+        return source if source.mode == 'RGBA' else source.convert('RGBA')
+    decoded = cache.setdefault(source, {})
+    if target not in decoded:
+        decoded[target] = open_hashed(source, target)
+    return decoded[target]
+
+@profiled
+def resize_and_cover(image, target_width, target_height):
+    """Resize image to cover the target dimensions, cropping the centered overflow"""
+    img_width, img_height = image.size
+    scale = max(target_width / img_width, target_height / img_height)
+    new_width = max(target_width, round(img_width * scale))
+    new_height = max(target_height, round(img_height * scale))
+    resized = cached_resize(image, (new_width, new_height), 'cover')
+    left = (new_width - target_width) // 2
+    top = (new_height - target_height) // 2
+    return resized.crop((left, top, left + target_width, top + target_height))
+
+def render_billboard(content, mode, width, height, reference=None):
+    """Render a single billboard tile for the given mode"""
+    if mode == 'stretch':
+        return cached_resize(content, (width, height), 'stretch')
+    if mode == 'letterbox':
+        from replace_billboards import resize_and_fit
+        return resize_and_fit(content, width, height)
+    if mode == 'cover':
+        return resize_and_cover(content, width, height)
+    if mode == 'framed':
+        from add_billboard_frames import create_billboard_with_frame
+        return create_billboard_with_frame(content, width, height)
+    if mode == 'edge-frame':
+        from replace_billboards_with_frame import create_billboard_with_frame
+        return create_billboard_with_frame(content, reference)
+    if mode == 'original-frame':
+        from fix_billboards_with_frames import create_billboard_with_original_frame
+        return create_billboard_with_original_frame(content, reference)
+    if mode == 'framed-from-reference':
+        from insert_images_into_billboards import insert_content_into_billboard
+        return insert_content_into_billboard(content, reference)
+    if mode == 'masked':
+        from panel_mask import insert_into_panel
+        return insert_into_panel(content, reference)
+    raise ValueError(f"Unknown mode: {mode}. Available: {list(MODES)}")
+
+def validate_jobs(jobs, billboards=BILLBOARDS):
+    """Check billboard names, modes and references before any pixel work"""
+    for job in jobs:
+        if job.billboard not in billboards:
+            raise ValueError(f"{job.billboard} not found. Available: {list(billboards.keys())}")
+        if job.mode not in MODES:
+            raise ValueError(f"Unknown mode: {job.mode}. Available: {list(MODES)}")
+        if job.mode in REFERENCE_MODES and job.reference is None:
+            raise ValueError(f"{job.billboard}: mode '{job.mode}' needs a reference billboard")
+
+@profiled
+def render_job(job, rect, cache):
+    """Render one job into (x, y, tile)"""
+    x, y, w, h = rect
+    # Every mode resamples the content to at most cover the tile
+    content = load_rgba(job.image, cache, (w, h))
+    reference = load_rgba(job.reference, cache) if job.reference is not None else None
+    return x, y, render_billboard(content, job.mode, w, h, reference)
+
+# Decoded sources, kept per worker process across the jobs it renders
+_worker_cache = {}
+
+def _render_job_raw(args):
+    """Worker entry point: render a job and return its tile as a raw buffer
+
+    Profile records and anything the renderer printed are passed back along
+    with the tile, so the parent can print them in job order.
+    """
+    job, rect = args
+    output = io.StringIO()
+    with redirect_stdout(output):
+        x, y, tile = render_job(job, rect, _worker_cache)
+    return x, y, tile.mode, tile.size, tile.tobytes(), profiling.drain(), output.getvalue()
+
+def render_jobs(jobs, billboards=BILLBOARDS, workers=1):
+    """Render every job into a list of (x, y, tile)
+
+    With workers > 1 tiles are rendered on a process pool and passed back as
+    raw pixel buffers, in job order, with the output of each job.
+    """
+    validate_jobs(jobs, billboards)
+    tasks = [(job, billboards[job.billboard]) for job in jobs]
+    tiles = []
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            for x, y, mode, size, data, records, output in executor.map(_render_job_raw, tasks):
+                tiles.append((x, y, Image.frombuffer(mode, size, data, 'raw', mode, 0, 1)))
+                profiling.merge(records)
+                print(output, end='')
+    else:
+        cache = {}
+        tiles = [render_job(job, rect, cache) for job, rect in tasks]
+    for job, (x, y, tile) in zip(jobs, tiles):
+        print(f"  ✓ Rendered {job.billboard} ({job.mode}, {tile.width}x{tile.height})")
+    return tiles
+
+@profiled
+def composite_tiles(spritesheet, tiles):
+    """Composite rendered tiles over an RGBA spritesheet buffer in place
+
+    Uses alpha "over" (see compositing.composite_over), so translucent
+    tile edges don't darken or punch holes in the sheet's alpha.
+    """
+    for x, y, tile in tiles:
+        composite_over(spritesheet, tile, x, y)
+    return spritesheet
+
+@profiled
+def sheets_written(result):
+    """Whether a build_spritesheets result means the sheets were rewritten"""
+    return result is not None and result != EXPORT_PENDING
+
+def build_spritesheets(spritesheet_paths, jobs, output_paths=None, billboards=BILLBOARDS,
+                       incremental=False, report_path=None, workers=1, optimize_png=False, max_error=None,
+                       formats=(), tiers=(), raw_atlas=False):
+    """Apply all jobs with a single decode and a single encode
+
+    The first existing path in spritesheet_paths is the source sheet. The
+    encoded result is written to every path in output_paths (defaults to
+    spritesheet_paths), skipping copies whose content already matches.
+
+    With incremental=True only jobs whose inputs changed since the last build
+    are rendered, and the run is skipped without decoding anything when none
+    did. report_path receives the billboard regions whose pixels changed.
+    workers > 1 renders the tiles on a process pool. optimize_png searches for
+    the smallest encoding, quantizing to a palette within max_error if given.
+    formats lists extra export formats (webp, avif) written next to every PNG.
+    tiers lists downscaled variants (e.g. 0.5, 0.25) written from the same sheet.
+    raw_atlas=True composites into the memory-mapped raw atlas of the source
+    (see raw_atlas) instead of a freshly decoded buffer and leaves encoding,
+    tiers and SPRITE_BOUNDS to 'python raw_atlas.py export'.
+    Returns the list of written paths, EXPORT_PENDING with raw_atlas=True,
+    or None when nothing was rebuilt (no spritesheet found, or no region
+    changed with incremental=True); see sheets_written.
+    """
+    source_path = next((path for path in spritesheet_paths if os.path.exists(path)), None)
+    if source_path is None:
+        print(f"Warning: no spritesheet found in {spritesheet_paths}, skipping")
+        return None
+    for path in spritesheet_paths:
+        if not os.path.exists(path):
+            print(f"Warning: {path} not found, skipping")
+    if output_paths is None:
+        output_paths = [path for path in spritesheet_paths if os.path.exists(path)]
+    
+    validate_jobs(jobs, billboards)
+    fingerprints = [(job.billboard, job_fingerprint(job, billboards[job.billboard])) for job in jobs]
+    state = load_state()
+    entry = state.get(sheet_key(source_path), {})
+    
+    if incremental:
+        dirty = dirty_jobs(entry, fingerprints, output_paths)
+        expected = export_paths(output_paths, available_formats(formats, warn=False)) + tier_paths(output_paths, tiers)
+        missing_exports = [path for path in expected if not os.path.exists(path)]
+        if not dirty and not missing_exports:
+            print("  = No billboard regions changed, skipping rebuild")
+            if report_path:
+                write_report(report_path, [], [])
+            return None
+        jobs = [jobs[i] for i in dirty]
+    
+    tiles = render_jobs(jobs, billboards, workers)
+    if raw_atlas:
+        buffer = open_atlas(source_path, edit=True)
+    else:
+        with span('billboard_batch.decode_spritesheet'):
+            count(bytes_decoded=os.path.getsize(source_path))
+            buffer = decode_rgba(source_path)
+    rendered = {job.billboard: billboards[job.billboard] for job in jobs}
+    before = region_hashes(buffer, rendered)
+    composite_tiles(buffer, tiles)
+    after = region_hashes(buffer, rendered)
+    changed = [name for name in rendered if before[name] != after[name]]
+    print(f"  Changed regions: {', '.join(changed) if changed else 'none'}")
+    state_entry = {
+        'output_hash': file_hash(output_paths[0]) if output_paths else None,
+        'jobs': dict(entry.get('jobs', {}), **dict(fingerprints)),
+        'regions': dict(entry.get('regions', {}), **after)
+    }
+    
+    if raw_atlas:
+        # The PNGs still hold the previous pixels; the atlas stays marked dirty
+        # until raw_atlas.py export writes them
+        buffer.flush()
+        state[sheet_key(source_path)] = state_entry
+        save_state(state)
+        if report_path:
+            write_report(report_path, changed, [])
+        print("  Raw atlas updated; run 'python raw_atlas.py export' to write the sheets")
+        return EXPORT_PENDING
+    
+    spritesheet = buffer_image(buffer)
+    written, skipped = save_spritesheet(spritesheet, output_paths, optimize_png, max_error, formats)
+    if tiers:
+        tier_written, _ = export_tiers(spritesheet, output_paths, tiers,
+                                       optimize=optimize_png, max_error=max_error, formats=formats)
+        written += tier_written
+    if changed and any(same_file(path, registered_spritesheets(PROJECT_ROOT)) for path in output_paths):
+        # Re-rendered billboards can change shape, so the game's opaque bounds follow the sheet
+        _, stale = write_bounds(buffer)
+        if stale:
+            print(f"  ✓ Updated SPRITE_BOUNDS in {', '.join(stale)}")
+    
+    state_entry['output_hash'] = file_hash(output_paths[0]) if output_paths else None
+    state[sheet_key(source_path)] = state_entry
+    save_state(state)
+    if report_path:
+        write_report(report_path, changed, written)
+    return written
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the billboard tooling
+Polls the manifest, every source image and reference frame and the sprite
+coordinate tables. On a change only the affected billboard tiles are
+re-rendered and patched into the in-memory sheet, and the outputs are
+rewritten at most once per debounce window
+Usage: python billboards.py watch manifest.yaml [--interval S] [--debounce S]
+"""
+
+import os
+import time
+import numpy as np
+
+from atlas_tiers import export_tiers
+from billboard_batch import render_job
+from compositing import buffer_image, composite_over, decode_rgba
+from raw_atlas import same_file
+from sheet_output import registered_spritesheets, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import PROJECT_ROOT, SOURCES, sprite_group
+
+# Coordinate tables; a change re-plans and re-renders everything
+TABLE_PATHS = [os.path.join(PROJECT_ROOT, source) for source in SOURCES]
+
+def file_stamps(paths):
+    """{path: (mtime_ns, size)} of every path, None for missing files"""
+    stamps = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+def job_sources(jobs):
+    """Every file path a list of jobs reads"""
+    return sorted({source for job in jobs for source in (job.image, job.reference) if isinstance(source, str)})
+
+def affected_jobs(jobs, changed):
+    """Jobs whose image or reference is among the changed paths"""
+    return [job for job in jobs if job.image in changed or job.reference in changed]
+
+class WatchSession:
+    """The pristine sheet, the patched sheet and the decoded sources of a watch run"""
+
+    def __init__(self, plan, output_options):
+        self.plan = plan
+        self.output_options = output_options
+        self.base = None
+        self.sheet = None
+        self.cache = {}
+        self.jobs = []
+        self.billboards = {}
+        self.spritesheet_paths = []
+        # Billboards whose pixels changed since the last write
+        self.changed = set()
+
+    def load(self):
+        """(Re)plan the manifest and render every job; the sheet is decoded only once"""
+        billboards = sprite_group('BILLBOARDS')
+        spritesheet_paths, jobs = self.plan(billboards)
+        if self.base is None or spritesheet_paths != self.spritesheet_paths:
+            source_path = next(path for path in spritesheet_paths if os.path.exists(path))
+            # The outputs are rewritten while watching, so every render
+            # starts from the sheet as it was when the watch began
+            self.base = decode_rgba(source_path)
+        self.billboards = billboards
+        self.jobs = jobs
+        self.spritesheet_paths = spritesheet_paths
+        self.sheet = self.base.copy()
+        # A new plan or table can move or drop billboards, not only re-render them
+        self.changed = set(billboards)
+        self.patch(jobs)
+
+    def patch(self, jobs):
+        """Re-render jobs and composite them over the pristine regions"""
+        for job in jobs:
+            start = time.perf_counter()
+            x, y, tile = render_job(job, self.billboards[job.billboard], self.cache)
+            before = self.sheet[y:y + tile.height, x:x + tile.width].copy()
+            self.sheet[y:y + tile.height, x:x + tile.width] = self.base[y:y + tile.height, x:x + tile.width]
+            composite_over(self.sheet, tile, x, y)
+            if not np.array_equal(before, self.sheet[y:y + tile.height, x:x + tile.width]):
+                self.changed.add(job.billboard)
+            print(f"  ↻ {job.billboard} ({job.mode}) in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def update(self, changed, replan):
+        """Apply a batch of changed paths"""
+        for path in changed:
+            self.cache.pop(path, None)
+        if replan:
+            self.load()
+        else:
+            self.patch(affected_jobs(self.jobs, changed))
+
+    def write(self):
+        output_paths = [path for path in self.spritesheet_paths if os.path.exists(path)]
+        options = dict(self.output_options)
+        tiers = options.pop('tiers', ())
+        spritesheet = buffer_image(self.sheet)
+        save_spritesheet(spritesheet, output_paths, **options)
+        if tiers:
+            export_tiers(spritesheet, output_paths, tiers, **options)
+        if self.changed and any(same_file(path, registered_spritesheets(PROJECT_ROOT)) for path in output_paths):
+            # Same as build_spritesheets: the game's opaque bounds follow the sheet
+            _, stale = write_bounds(self.sheet)
+            if stale:
+                print(f"  ✓ Updated SPRITE_BOUNDS in {', '.join(stale)}")
+        self.changed = set()
+
+    def watched_paths(self, manifest_path):
+        return [manifest_path] + TABLE_PATHS + job_sources(self.jobs)
+
+def watch(manifest_path, plan, interval=0.25, debounce=0.3, **output_options):
+    """Watch the inputs of a manifest until interrupted
+
+    plan(billboards) returns (spritesheet_paths, jobs) for the current
+    manifest. output_options are optimize, max_error, formats and tiers.
+    """
+    session = WatchSession(plan, output_options)
+    session.load()
+    session.write()
+    stamps = file_stamps(session.watched_paths(manifest_path))
+    print(f"\nWatching {len(stamps)} files (Ctrl+C to stop)...")
+
+    pending = set()
+    last_change = 0.0
+    try:
+        while True:
+            time.sleep(interval)
+            current = file_stamps(session.watched_paths(manifest_path))
+            changed = {path for path in current if current[path] != stamps.get(path)}
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+                stamps = current
+                continue
+            if not pending or time.monotonic() - last_change < debounce:
+                continue
+
+            names = ', '.join(os.path.basename(path) for path in sorted(pending))
+            print(f"\nChanged: {names}")
+            start = time.perf_counter()
+            try:
+                session.update(pending, replan=bool(pending & ({manifest_path} | set(TABLE_PATHS))))
+                session.write()
+                print(f"  Updated in {(time.perf_counter() - start) * 1000:.0f} ms")
+            except (OSError, ValueError, KeyError) as e:
+                # Keep watching: the file may be half-written or the manifest invalid
+                print(f"Error: {e}")
+            pending = set()
+            stamps = file_stamps(session.watched_paths(manifest_path))
+    except KeyboardInterrupt:
+        print("\nStopped watching")
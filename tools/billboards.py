@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Unified billboard CLI driven by a declarative job manifest
+Usage: python billboards.py apply manifest.yaml [--dry-run] [--incremental] [--changed-report PATH] [-j N]
+                                               [--optimize-png [--max-error E]] [--formats webp,avif] [--tiers 0.5,0.25]
+                                               [--raw-atlas] [--profile] [--profile-trace PATH]
+       python billboards.py watch manifest.yaml [--interval S] [--debounce S] [--optimize-png] [--formats ...] [--tiers ...]
+       python billboards.py list
+
+A manifest (YAML, or JSON with a .json extension) lists any number of
+billboard assignments. Image and reference paths are relative to the manifest,
+spritesheet paths to the project root:
+
+    spritesheets:            # optional, defaults to every registered copy
+      - game/assets/sprites.png
+    defaults:
+      fit: letterbox
+    billboards:
+      - billboard: BILLBOARD06
+        image: invopay.png
+        fit: cover
+      - billboard: BILLBOARD09
+        image: arc.png
+        fit: framed-from-reference
+        reference: extracted_billboards/BILLBOARD09.png
+
+Fit modes: stretch, letterbox, cover, framed, framed-from-reference, edge-frame,
+original-frame, masked. Reference modes default to the pristine frame of the billboard in
+the frame library (extracted_billboards/<BILLBOARD>.png, see frame_library.py).
+The whole batch is planned and validated before any pixel work; the source
+spritesheet is then decoded once and encoded once for every copy. watch keeps
+the sheet in memory and re-renders only the billboards whose inputs change.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import profiling
+from billboard_batch import (BILLBOARDS, MODES, REFERENCE_MODES, BillboardJob, add_batch_arguments,
+                             add_output_arguments, batch_options, build_spritesheets,
+                             sheets_written)
+from billboard_watch import watch
+from frame_library import frame_path
+from sheet_output import registered_spritesheets
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+def load_manifest(path):
+    """Read a YAML or JSON manifest into a dict"""
+    with open(path) as f:
+        if path.endswith('.json'):
+            manifest = json.load(f)
+        else:
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML is required for YAML manifests (pip install pyyaml), "
+                                 "or write the manifest as .json")
+            manifest = yaml.safe_load(f)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('billboards'), list):
+        raise ValueError(f"{path}: manifest needs a 'billboards' list")
+    return manifest
+
+def _resolve(path, base_dir):
+    return path if os.path.isabs(path) else os.path.normpath(os.path.join(base_dir, path))
+
+def plan_manifest(manifest, base_dir, project_root=PROJECT_ROOT, billboards=BILLBOARDS):
+    """Turn a manifest into (spritesheet_paths, jobs) without touching any pixels
+
+    Every problem in the manifest is collected and raised as one ValueError.
+    """
+    errors = []
+    defaults = manifest.get('defaults') or {}
+    jobs = []
+    assigned = {}
+    for index, entry in enumerate(manifest['billboards'], 1):
+        if not isinstance(entry, dict) or 'billboard' not in entry or 'image' not in entry:
+            errors.append(f"entry {index}: needs 'billboard' and 'image'")
+            continue
+        name = entry['billboard']
+        fit = entry.get('fit', defaults.get('fit', 'stretch'))
+        image_path = _resolve(entry['image'], base_dir)
+        reference = entry.get('reference', defaults.get('reference'))
+
+        if name not in billboards:
+            errors.append(f"entry {index}: {name} not found. Available: {list(billboards.keys())}")
+        elif name in assigned:
+            errors.append(f"entry {index}: {name} is already assigned by entry {assigned[name]}")
+        else:
+            assigned[name] = index
+        if fit not in MODES:
+            errors.append(f"entry {index}: unknown fit '{fit}'. Available: {list(MODES)}")
+        if not os.path.exists(image_path):
+            errors.append(f"entry {index}: image not found: {image_path}")
+
+        if fit in REFERENCE_MODES:
+            if reference is None:
+                reference = frame_path(name)
+            else:
+                reference = _resolve(reference, base_dir)
+            if not os.path.exists(reference):
+                errors.append(f"entry {index}: reference billboard not found: {reference}")
+        elif reference is not None:
+            errors.append(f"entry {index}: fit '{fit}' does not take a reference")
+            reference = None
+
+        jobs.append(BillboardJob(image_path, name, fit, reference))
+
+    sheets = manifest.get('spritesheets')
+    if sheets:
+        spritesheet_paths = [_resolve(path, project_root) for path in sheets]
+    else:
+        spritesheet_paths = registered_spritesheets(project_root)
+    if not any(os.path.exists(path) for path in spritesheet_paths):
+        errors.append(f"no spritesheet found in {spritesheet_paths}")
+
+    if errors:
+        raise ValueError("Invalid manifest:\n  " + "\n  ".join(errors))
+    return spritesheet_paths, jobs
+
+def print_plan(spritesheet_paths, jobs, billboards=BILLBOARDS):
+    """Print what an apply run is going to do"""
+    existing = [path for path in spritesheet_paths if os.path.exists(path)]
+    print(f"Source: {os.path.relpath(existing[0], PROJECT_ROOT)}")
+    for path in existing:
+        print(f"  → {os.path.relpath(path, PROJECT_ROOT)}")
+    print(f"\n{len(jobs)} billboard(s):")
+    for job in jobs:
+        x, y, w, h = billboards[job.billboard]
+        line = f"  {job.billboard} ({w}x{h}): {os.path.relpath(job.image)} [{job.mode}]"
+        if job.reference is not None:
+            line += f" frame from {os.path.relpath(job.reference)}"
+        print(line)
+
+def apply(args):
+    manifest_path = os.path.abspath(args.manifest)
+    try:
+        manifest = load_manifest(manifest_path)
+        spritesheet_paths, jobs = plan_manifest(manifest, os.path.dirname(manifest_path))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print_plan(spritesheet_paths, jobs)
+    if args.dry_run:
+        return 0
+    print()
+    if not sheets_written(build_spritesheets(spritesheet_paths, jobs, **batch_options(args))):
+        return 0
+    print("\n✓ Manifest applied")
+    return 0
+
+def watch_manifest(args):
+    manifest_path = os.path.abspath(args.manifest)
+
+    def plan(billboards):
+        manifest = load_manifest(manifest_path)
+        return plan_manifest(manifest, os.path.dirname(manifest_path), billboards=billboards)
+
+    try:
+        print_plan(*plan(BILLBOARDS))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    print()
+    watch(manifest_path, plan, args.interval, args.debounce, optimize=args.optimize_png,
+          max_error=args.max_error, formats=args.formats, tiers=args.tiers)
+    return 0
+
+def list_billboards(args):
+    print("Billboards:")
+    for name, (x, y, w, h) in BILLBOARDS.items():
+        print(f"  {name}: {w}x{h} at ({x}, {y})")
+    print(f"\nFit modes: {', '.join(MODES)}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply billboard assignments from a manifest")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    apply_parser = commands.add_parser('apply', help='render and composite every billboard in a manifest')
+    apply_parser.add_argument('manifest', help='YAML or JSON manifest')
+    apply_parser.add_argument('--dry-run', action='store_true', help='validate and print the plan only')
+    add_batch_arguments(apply_parser)
+    apply_parser.set_defaults(func=apply)
+
+    watch_parser = commands.add_parser('watch', help='re-render billboards whenever their sources change')
+    watch_parser.add_argument('manifest', help='YAML or JSON manifest')
+    watch_parser.add_argument('--interval', type=float, default=0.25, metavar='S',
+                              help='seconds between checks for changed files')
+    watch_parser.add_argument('--debounce', type=float, default=0.3, metavar='S',
+                              help='quiet seconds to wait after a change before rewriting the outputs')
+    add_output_arguments(watch_parser)
+    watch_parser.set_defaults(func=watch_manifest)
+
+    list_parser = commands.add_parser('list', help='list billboards and fit modes')
+    list_parser.set_defaults(func=list_billboards)
+
+    args = parser.parse_args(argv)
+    if args.command == 'apply':
+        profiling.configure(args.profile, args.profile_trace)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Incremental build state for spritesheet rebuilds
+Tracks a fingerprint of the inputs of every billboard job and a content hash
+of every billboard region, so unchanged runs can be skipped without decoding
+"""
+
+from PIL import Image
+import hashlib
+import json
+import os
+
+from profiling import profiled
+from resize_cache import CACHE_DIR, image_hash
+from sheet_output import atomic_write, file_hash
+
+STATE_PATH = os.path.join(CACHE_DIR, 'build_state.json')
+
+# Bump when tile rendering changes so every region is treated as dirty
+RENDER_VERSION = 5
+
+def source_fingerprint(source):
+    """Hash of a job input (file path or PIL image)"""
+    if source is None:
+        return None
+    if isinstance(source, Image.Image):
+        return image_hash(source)
+    return file_hash(source)
+
+def job_fingerprint(job, rect):
+    """Fingerprint of everything that determines a job's rendered tile"""
+    key = json.dumps([
+        RENDER_VERSION,
+        job.mode,
+        list(rect),
+        source_fingerprint(job.image),
+        source_fingerprint(job.reference)
+    ])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+@profiled
+def region_hashes(spritesheet, billboards):
+    """Content hash of every billboard region of an in-memory spritesheet
+
+    spritesheet is an RGBA Image or a (height, width, 4) buffer from compositing.
+    """
+    hashes = {}
+    for name, (x, y, w, h) in billboards.items():
+        if isinstance(spritesheet, Image.Image):
+            region = spritesheet.crop((x, y, x + w, y + h)).tobytes()
+        else:
+            region = spritesheet[y:y + h, x:x + w].tobytes()
+        hashes[name] = hashlib.sha256(region).hexdigest()
+    return hashes
+
+def load_state(path=STATE_PATH):
+    """Load the build state of every known spritesheet"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state, path=STATE_PATH):
+    """Persist the build state"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps(state, indent=2, sort_keys=True).encode())
+
+def sheet_key(spritesheet_path):
+    """State key for a spritesheet"""
+    return os.path.abspath(spritesheet_path)
+
+def dirty_jobs(entry, fingerprints, output_paths):
+    """Indexes of jobs that must be re-rendered for a spritesheet
+
+    Every job is dirty when the outputs no longer match the last build.
+    """
+    if not entry or any(file_hash(path) != entry.get('output_hash') for path in output_paths):
+        return list(range(len(fingerprints)))
+    previous = entry.get('jobs', {})
+    return [i for i, (name, fingerprint) in enumerate(fingerprints) if previous.get(name) != fingerprint]
+
+def rebase_output_hash(spritesheet_path, previous_hash, output_paths, path=STATE_PATH):
+    """Point the state of a spritesheet at its re-exported outputs
+
+    Only done when the state matched the outputs before the export, so jobs
+    stay clean only if they were clean against the previous sheet too.
+    """
+    state = load_state(path)
+    entry = state.get(sheet_key(spritesheet_path))
+    if not entry or entry.get('output_hash') != previous_hash:
+        return
+    entry['output_hash'] = file_hash(output_paths[0])
+    save_state(state, path)
+
+def write_report(report_path, changed_regions, written):
+    """Write the changed regions for the deploy step"""
+    report = {
+        'changed': changed_regions,
+        'written': written,
+        'invalidate': bool(changed_regions)
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Straight-alpha compositing core for spritesheet builds
+The sheet is decoded once into a writable uint8 RGBA buffer; tiles are
+composited over it in place with the fixed-point Porter-Duff "over" of
+Pillow's alpha_composite, and the buffer is handed to the encoder without
+another copy. Only the sheet skips intermediate Images: the tiles themselves
+are still rendered as Pillow Images (crop, resize, convert) by the
+per-mode renderers in billboard_batch
+"""
+
+from PIL import Image
+import numpy as np
+
+from profiling import count, profiled
+
+# Rows copied from the decoded image per step, so filling the buffer never
+# holds a second full-size copy of the sheet
+STRIP_ROWS = 256
+
+@profiled
+def decode_rgba(path, allocate=None):
+    """Decode an image into a writable (height, width, 4) uint8 RGBA buffer
+
+    allocate(width, height) may supply the buffer, e.g. a memory-mapped file.
+    """
+    with Image.open(path) as image:
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        if allocate is None:
+            buffer = np.empty((image.height, image.width, 4), dtype=np.uint8)
+        else:
+            buffer = allocate(image.width, image.height)
+        for top in range(0, image.height, STRIP_ROWS):
+            bottom = min(top + STRIP_ROWS, image.height)
+            buffer[top:bottom] = np.asarray(image.crop((0, top, image.width, bottom)))
+    count(pixels=image.width * image.height)
+    return buffer
+
+def buffer_image(buffer):
+    """RGBA Image sharing memory with a buffer, for encoding"""
+    return Image.frombuffer('RGBA', (buffer.shape[1], buffer.shape[0]), buffer, 'raw', 'RGBA', 0, 1)
+
+def rgba_array(image):
+    """Straight-alpha RGBA pixels of an Image or array"""
+    if isinstance(image, np.ndarray):
+        return image
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    return np.asarray(image)
+
+# Fraction bits of Pillow's alpha_composite colour weights
+PRECISION_BITS = 7
+
+def _div255(values):
+    """Rounded division by 255 with shifts, as Pillow's SHIFTFORDIV255"""
+    return ((values >> 8) + values) >> 8
+
+def pixel_diff(a, b, tolerance=0):
+    """(pixels differing by more than tolerance, largest difference) of two RGBA arrays
+
+    Pixels transparent in both count as equal whatever their colour, so
+    sprite files and sheet regions agree on what "differs" means.
+    """
+    diff = np.abs(a.astype(np.int16) - b.astype(np.int16)).max(axis=2)
+    diff[(a[..., 3] == 0) & (b[..., 3] == 0)] = 0
+    return int((diff > tolerance).sum()), int(diff.max()) if diff.size else 0
+
+def composite_over(buffer, tile, x, y):
+    """Composite a straight-alpha tile over buffer at (x, y), in place
+
+    Uses the fixed-point arithmetic of Pillow's alpha_composite, so results
+    match Image.alpha_composite bit for bit: translucent tile edges over
+    transparent sheet areas keep their colour instead of being darkened by a
+    second multiply by alpha, and sheet alpha is never reduced under a tile.
+    """
+    src = rgba_array(tile)
+    height, width = buffer.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + src.shape[1], width), min(y + src.shape[0], height)
+    if x1 <= x0 or y1 <= y0:
+        return buffer
+    src = src[y0 - y:y1 - y, x0 - x:x1 - x]
+    dst = buffer[y0:y1, x0:x1]
+    if src[..., 3].min() == 255:
+        dst[...] = src
+        return buffer
+
+    src_alpha = src[..., 3:].astype(np.uint32)
+    # Output alpha scaled by 255, and the tile's share of the colour with
+    # PRECISION_BITS of fraction, as in libImaging/AlphaComposite.c
+    alpha = src_alpha * 255 + dst[..., 3:] * (255 - src_alpha)
+    covered = src_alpha > 0
+    src_coef = src_alpha * (255 * 255 << PRECISION_BITS) // np.where(covered, alpha, 1)
+    dst_coef = (255 << PRECISION_BITS) - src_coef
+    colour = src[..., :3] * src_coef + dst[..., :3] * dst_coef + (0x80 << PRECISION_BITS)
+    colour = _div255(colour) >> PRECISION_BITS
+    dst[..., :3] = np.where(covered, colour, dst[..., :3])
+    dst[..., 3:] = np.where(covered, _div255(alpha + 0x80), dst[..., 3:])
+    return buffer
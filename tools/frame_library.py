@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Reference-frame library of pristine billboard frames
+extracted_billboards/ holds, for every billboard, the frame pixels as they were
+in a known-good sheet, a binary panel mask (<NAME>.mask.png, see panel_mask)
+and an index (frames.json) with the frame insets, content rect, mask bounds
+and file hashes. The tools
+load frames from here instead of re-cropping a sheet that may already have
+been overwritten
+Usage: python frame_library.py [list | build [--rev REV [--path PATH] | --sheet PATH] [--force]]
+"""
+
+from PIL import Image
+import argparse
+import hashlib
+import io
+import json
+import os
+import subprocess
+import numpy as np
+
+from frame_ops import content_box, detect_frame_insets
+from panel_mask import mask_bounds, panel_mask
+from sheet_output import atomic_write, content_hash, encode_png
+from sprite_registry import sprite_group
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+LIBRARY_DIR = os.path.join(SCRIPT_DIR, 'extracted_billboards')
+INDEX_NAME = 'frames.json'
+SHEET_PATH = os.path.join('game', 'assets', 'sprites.png')
+
+_index = None
+
+def frame_path(name, library_dir=LIBRARY_DIR):
+    return os.path.join(library_dir, f"{name}.png")
+
+def mask_path(name, library_dir=LIBRARY_DIR):
+    return os.path.join(library_dir, f"{name}.mask.png")
+
+def load_index(library_dir=LIBRARY_DIR):
+    """The library index as {name: entry}, empty if the library was never built"""
+    global _index
+    if _index is None or _index[0] != library_dir:
+        path = os.path.join(library_dir, INDEX_NAME)
+        frames = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                frames = json.load(f)['frames']
+        _index = (library_dir, frames)
+    return _index[1]
+
+def frame_entry(name, library_dir=LIBRARY_DIR):
+    """Index entry of a frame; KeyError with a hint if it isn't in the library"""
+    frames = load_index(library_dir)
+    if name not in frames:
+        raise KeyError(f"{name} is not in the frame library. Build it with: python frame_library.py build")
+    return frames[name]
+
+def load_frame(name, library_dir=LIBRARY_DIR):
+    """Pristine frame of a billboard as RGBA, with its precomputed insets and panel mask
+
+    The file hash is checked against the index so an edited frame is noticed.
+    """
+    entry = frame_entry(name, library_dir)
+    with open(frame_path(name, library_dir), 'rb') as f:
+        data = f.read()
+    source_hash = content_hash(data)
+    if source_hash != entry['hash']:
+        print(f"Warning: {name}.png changed since the frame library was built; rebuild it to update the index")
+    frame = Image.open(io.BytesIO(data)).convert('RGBA')
+    frame.info['source_hash'] = source_hash
+    if source_hash == entry['hash']:
+        frame.info['frame_insets'] = tuple(entry['insets'])
+        frame.info['panel_mask'] = load_mask(name, library_dir)
+    return frame
+
+def load_mask(name, library_dir=LIBRARY_DIR):
+    """Panel mask of a billboard as a boolean (height, width) array"""
+    frame_entry(name, library_dir)
+    with Image.open(mask_path(name, library_dir)) as mask:
+        return np.asarray(mask.convert('L')) > 0
+
+def sheet_from_revision(rev, path=SHEET_PATH):
+    """Encoded bytes of the sheet as committed at a git revision"""
+    return subprocess.run(['git', 'show', f"{rev}:{path}"], cwd=PROJECT_ROOT,
+                          capture_output=True, check=True).stdout
+
+def sheet_source(path, data):
+    """Provenance of a frame: the sheet's path and the hash of its bytes
+
+    Revision ids are not recorded, since they don't survive a rebase.
+    """
+    return f"{path} sha256:{content_hash(data)}"
+
+def build(frames, source, library_dir=LIBRARY_DIR, write_frames=True):
+    """Write every frame, its mask and the index
+
+    frames is {name: RGBA image}; source describes where they came from.
+    With write_frames=False the frame PNGs already in the library are indexed
+    as is, keeping the recorded source of frames whose pixels are unchanged.
+    Frame files that already hold the same pixels are not re-encoded.
+    """
+    os.makedirs(library_dir, exist_ok=True)
+    previous = load_index(library_dir)
+    index = {}
+    for name, frame in frames.items():
+        pixels_hash = hashlib.sha256(frame.tobytes()).hexdigest()
+        unchanged = (previous.get(name, {}).get('pixels_hash') == pixels_hash
+                     and os.path.exists(frame_path(name, library_dir)))
+        if write_frames and not unchanged:
+            data = encode_png(frame)
+            atomic_write(frame_path(name, library_dir), data)
+        else:
+            with open(frame_path(name, library_dir), 'rb') as f:
+                data = f.read()
+        insets = detect_frame_insets(frame)
+        rect = content_box(frame.width, frame.height, insets)
+        mask = panel_mask(frame, insets)
+        frame_source = previous[name]['source'] if unchanged and not write_frames else source
+        atomic_write(mask_path(name, library_dir), encode_png(Image.fromarray(mask).convert('1')))
+        index[name] = {
+            'size': list(frame.size),
+            'insets': list(insets),
+            'content_rect': list(rect),
+            'mask_rect': list(mask_bounds(mask)),
+            'hash': content_hash(data),
+            'pixels_hash': pixels_hash,
+            'source': frame_source
+        }
+        print(f"  ✓ {name}: {frame.width}x{frame.height}, "
+              f"content {rect[2] - rect[0]}x{rect[3] - rect[1]} at ({rect[0]}, {rect[1]})")
+    atomic_write(os.path.join(library_dir, INDEX_NAME), json.dumps({'frames': index}, indent=2).encode())
+    global _index
+    _index = None
+    return index
+
+def changed_frames(frames, library_dir=LIBRARY_DIR):
+    """Names whose pixels differ from the frames already in the library"""
+    index = load_index(library_dir)
+    return [name for name, frame in frames.items()
+            if name in index and hashlib.sha256(frame.tobytes()).hexdigest() != index[name]['pixels_hash']]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or list the pristine billboard frame library")
+    parser.add_argument('command', nargs='?', choices=('list', 'build'), default='list')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--rev', help='crop frames from the sheet at this git revision')
+    source.add_argument('--sheet', metavar='PATH', help='crop frames from this known-good sheet')
+    parser.add_argument('--path', default=SHEET_PATH,
+                        help="with --rev, the sheet's path in that revision (e.g. 'game/assets/sprites copy.png')")
+    parser.add_argument('--force', action='store_true', help='replace library frames whose pixels differ')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        index = load_index()
+        if not index:
+            print("Frame library is empty. Build it with: python frame_library.py build")
+        for name, entry in index.items():
+            left, top, right, bottom = entry['content_rect']
+            print(f"{name}: {entry['size'][0]}x{entry['size'][1]}, insets {entry['insets']}, "
+                  f"content {right - left}x{bottom - top} at ({left}, {top}) [{entry['source']}]")
+        return
+
+    billboards = sprite_group('BILLBOARDS')
+    if not (args.rev or args.sheet):
+        # Index the frames already in the library directory as they are
+        frames = {name: Image.open(frame_path(name)).convert('RGBA')
+                  for name in billboards if os.path.exists(frame_path(name))}
+        build(frames, os.path.relpath(LIBRARY_DIR, PROJECT_ROOT), write_frames=False)
+        return
+
+    if args.rev:
+        data, path = sheet_from_revision(args.rev, args.path), args.path
+    else:
+        with open(args.sheet, 'rb') as f:
+            data = f.read()
+        path = os.path.relpath(os.path.abspath(args.sheet), PROJECT_ROOT)
+    sheet = Image.open(io.BytesIO(data)).convert('RGBA')
+    source = sheet_source(path, data)
+    frames = {name: sheet.crop((x, y, x + w, y + h)) for name, (x, y, w, h) in billboards.items()}
+    changed = changed_frames(frames)
+    if changed and not args.force:
+        print(f"Error: {', '.join(changed)} differ from the library frames; the sheet may already have been "
+              f"modified. Use --force to replace them.")
+        return
+    build(frames, source)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Vectorized billboard frame extraction, frame detection and border compositing
+Usage: python frame_ops.py [--benchmark] [--detect] [--repeat N]
+"""
+
+from PIL import Image
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+from resize_cache import CACHE_DIR, image_hash
+
+INSETS_CACHE_PATH = os.path.join(CACHE_DIR, 'frame_insets.json')
+_insets_cache = None
+
+def as_insets(thickness):
+    """Normalize a thickness or (top, right, bottom, left) tuple to insets"""
+    if isinstance(thickness, int):
+        return (thickness, thickness, thickness, thickness)
+    return tuple(thickness)
+
+def content_box(width, height, thickness):
+    """(left, top, right, bottom) of the area inside the frame"""
+    top, right, bottom, left = as_insets(thickness)
+    return (left, top, width - right, height - bottom)
+
+def border_boxes(width, height, thickness):
+    """Non-overlapping (left, top, right, bottom) boxes covering a border
+
+    thickness is a single value or (top, right, bottom, left) insets.
+    """
+    top, right, bottom, left = (max(0, t) for t in as_insets(thickness))
+    if top + bottom >= height or left + right >= width:
+        return [(0, 0, width, height)]
+    boxes = [
+        (0, 0, width, top),                              # Top
+        (0, height - bottom, width, height),             # Bottom
+        (0, top, left, height - bottom),                 # Left
+        (width - right, top, width, height - bottom)     # Right
+    ]
+    return [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+
+def extract_frame(billboard, thickness):
+    """Keep only the outer border of a billboard, everything else transparent"""
+    if billboard.mode != 'RGBA':
+        billboard = billboard.convert('RGBA')
+    img_array = np.asarray(billboard)
+    frame = np.zeros_like(img_array)
+    for left, top, right, bottom in border_boxes(billboard.width, billboard.height, thickness):
+        frame[top:bottom, left:right] = img_array[top:bottom, left:right]
+    return Image.fromarray(frame, 'RGBA')
+
+def composite_frame(image, billboard, thickness):
+    """Alpha-composite the border of billboard over image, in place
+
+    Only the border strips are touched; the result matches compositing the
+    full extract_frame() image over image.
+    """
+    for left, top, right, bottom in border_boxes(billboard.width, billboard.height, thickness):
+        image.alpha_composite(billboard, (left, top), (left, top, right, bottom))
+    return image
+
+def _side_profiles(img_array, band):
+    """Line stacks for each side, ordered from the outer edge inwards
+
+    Only the central band of each edge is sampled so posts, hangers and
+    corner highlights don't count as frame.
+    """
+    height, width = img_array.shape[:2]
+    y0, y1 = int(height * (1 - band) / 2), int(height * (1 + band) / 2)
+    x0, x1 = int(width * (1 - band) / 2), int(width * (1 + band) / 2)
+    return {
+        'top': img_array[:height // 2, x0:x1],
+        'right': img_array[y0:y1, :width // 2 - 1:-1].transpose(1, 0, 2),
+        'bottom': img_array[:height // 2 - 1:-1, x0:x1],
+        'left': img_array[y0:y1, :width // 2].transpose(1, 0, 2)
+    }
+
+def _side_inset(lines, tolerance, max_band, max_inset):
+    """Inset of one side from its (depth, length, 4) line stack"""
+    depth = min(len(lines), max_inset)
+    lines = lines[:depth]
+    # Alpha transition: skip the transparent margin outside the frame
+    opaque = (lines[..., 3] >= 128).mean(axis=1) >= 0.9
+    if not opaque.any():
+        return 0
+    start = int(np.argmax(opaque))
+    # Distance profile: each line against its own median colour and the
+    # previous line's colour
+    colours = np.median(lines[..., :3], axis=1)
+    uniform = (np.abs(lines[..., :3] - colours[:, None, :]).max(axis=2) <= tolerance).mean(axis=1) >= 0.9
+    uniform &= opaque
+    changes = np.abs(np.diff(colours, axis=0)).max(axis=1) > tolerance
+    band_starts = np.concatenate(([start], start + 1 + np.flatnonzero(changes[start:]), [depth]))
+    # The frame is a stack of short uniform bands; the first long or
+    # non-uniform band is the content panel
+    for band_start, band_end in zip(band_starts[:-1], band_starts[1:]):
+        if band_end - band_start > max_band or not uniform[band_start:band_end].all():
+            return int(band_start)
+    return depth
+
+def _load_insets_cache():
+    global _insets_cache
+    if _insets_cache is None:
+        _insets_cache = {}
+        if os.path.exists(INSETS_CACHE_PATH):
+            try:
+                with open(INSETS_CACHE_PATH) as f:
+                    _insets_cache = json.load(f)
+            except (OSError, ValueError):
+                _insets_cache = {}
+    return _insets_cache
+
+def _save_insets_cache():
+    os.makedirs(os.path.dirname(INSETS_CACHE_PATH), exist_ok=True)
+    tmp_path = f"{INSETS_CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_insets_cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, INSETS_CACHE_PATH)
+
+def detect_frame_insets(billboard, tolerance=30, max_band=12, band=0.5, max_fraction=0.25):
+    """Detect the frame thickness on every side of a billboard
+
+    Returns (top, right, bottom, left) insets of the content area. Frames from
+    the frame library carry precomputed insets; other results are memoized per
+    billboard hash, in memory and under tools/.cache.
+    """
+    if 'frame_insets' in billboard.info:
+        return tuple(billboard.info['frame_insets'])
+    if billboard.mode != 'RGBA':
+        billboard = billboard.convert('RGBA')
+    key = f"{image_hash(billboard)}:{tolerance}:{max_band}:{band}:{max_fraction}"
+    cache = _load_insets_cache()
+    if key in cache:
+        return tuple(cache[key])
+
+    img_array = np.asarray(billboard).astype(np.int16)
+    height, width = img_array.shape[:2]
+    sides = _side_profiles(img_array, band)
+    insets = (
+        _side_inset(sides['top'], tolerance, max_band, int(height * max_fraction)),
+        _side_inset(sides['right'], tolerance, max_band, int(width * max_fraction)),
+        _side_inset(sides['bottom'], tolerance, max_band, int(height * max_fraction)),
+        _side_inset(sides['left'], tolerance, max_band, int(width * max_fraction))
+    )
+    cache[key] = list(insets)
+    _save_insets_cache()
+    return insets
+
+def extract_frame_loop(billboard_img, frame_thickness):
+    """Per-pixel reference implementation, kept for the benchmark"""
+    width, height = billboard_img.size
+    frame = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    frame_pixels = frame.load()
+    billboard_pixels = billboard_img.load()
+    for y in range(height):
+        for x in range(width):
+            if (x < frame_thickness or x >= width - frame_thickness or
+                y < frame_thickness or y >= height - frame_thickness):
+                frame_pixels[x, y] = billboard_pixels[x, y]
+    return frame
+
+def benchmark(billboard, thickness=3, repeat=5):
+    """Time the per-pixel loop against the vectorized extraction"""
+    results = {}
+    for name, fn in (('loop', extract_frame_loop), ('vectorized', extract_frame)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            frame = fn(billboard, thickness)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, frame)
+    identical = results['loop'][1].tobytes() == results['vectorized'][1].tobytes()
+    return results['loop'][0], results['vectorized'][0], identical
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized billboard frame operations")
+    parser.add_argument('--benchmark', action='store_true', help='compare against the per-pixel loop')
+    parser.add_argument('--detect', action='store_true', help='print detected frame insets of the extracted billboards')
+    parser.add_argument('--repeat', type=int, default=5, help='benchmark repetitions (best time is reported)')
+    parser.add_argument('--thickness', type=int, default=3, help='frame thickness in pixels')
+    args = parser.parse_args()
+
+    if not args.benchmark and not args.detect:
+        parser.print_help()
+        return
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    extracted_dir = os.path.join(script_dir, 'extracted_billboards')
+
+    if args.detect:
+        for name in sorted(os.listdir(extracted_dir)):
+            if name.endswith('.png') and not name.endswith('.mask.png'):
+                billboard = Image.open(os.path.join(extracted_dir, name))
+                top, right, bottom, left = detect_frame_insets(billboard)
+                print(f"{name[:-4]}: top={top} right={right} bottom={bottom} left={left}")
+        if not args.benchmark:
+            return
+
+    for name in ('BILLBOARD05', 'BILLBOARD09'):
+        path = os.path.join(extracted_dir, f"{name}.png")
+        if not os.path.exists(path):
+            print(f"Warning: {path} not found, skipping")
+            continue
+        billboard = Image.open(path).convert('RGBA')
+        loop, vectorized, identical = benchmark(billboard, args.thickness, args.repeat)
+        print(f"{name} ({billboard.width}x{billboard.height}, {billboard.width * billboard.height} pixels):")
+        print(f"  Per-pixel loop: {loop * 1000:8.2f} ms")
+        print(f"  Vectorized:     {vectorized * 1000:8.2f} ms")
+        print(f"  Speedup:        {loop / vectorized:8.1f}x ({'identical' if identical else 'DIFFERENT'} output)")
+
+if __name__ == "__main__":
+    main()
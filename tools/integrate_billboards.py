@@ -1,56 +1,34 @@
 #!/usr/bin/env python3
 """
 Integrate new billboard images into the spritesheet
-Usage: python integrate_billboards.py image1.png BILLBOARD_NAME1 image2.png BILLBOARD_NAME2 image3.png BILLBOARD_NAME3
+Usage: python integrate_billboards.py image1.png BILLBOARD_NAME1 [image2.png BILLBOARD_NAME2 ...]
+For larger batches and other fit modes, see billboards.py
 """
 
-from PIL import Image
 import sys
 import os
 
-# Billboard positions and dimensions
-BILLBOARDS = {
-    'BILLBOARD01': (625, 375, 300, 170),
-    'BILLBOARD02': (245, 1262, 215, 220),
-    'BILLBOARD03': (5, 1262, 230, 220),
-    'BILLBOARD04': (1205, 310, 268, 170),
-    'BILLBOARD05': (5, 897, 298, 190),
-    'BILLBOARD06': (488, 555, 298, 190),
-    'BILLBOARD07': (313, 897, 298, 190),
-    'BILLBOARD08': (230, 5, 385, 265),
-    'BILLBOARD09': (150, 555, 328, 282)
-}
+from billboard_batch import BILLBOARDS, BillboardJob, build_spritesheets, sheets_written
+from profiling import profiled
+from sheet_output import registered_spritesheets
 
+@profiled
 def update_spritesheet(spritesheet_path, new_image_path, billboard_name):
     """Update a billboard in the spritesheet"""
     if billboard_name not in BILLBOARDS:
         print(f"Error: {billboard_name} not found. Available: {list(BILLBOARDS.keys())}")
         return False
     
-    # Open spritesheet
-    spritesheet = Image.open(spritesheet_path).convert('RGBA')
-    
-    # Open and resize new image
-    new_img = Image.open(new_image_path).convert('RGBA')
     x, y, w, h = BILLBOARDS[billboard_name]
-    
     print(f"Updating {billboard_name} at ({x}, {y}) with size {w}x{h}")
-    print(f"  Original image size: {new_img.size}")
-    
-    # Resize new image to fit billboard dimensions (maintain aspect ratio, center crop)
-    new_img_resized = new_img.resize((w, h), Image.Resampling.LANCZOS)
-    
-    # Paste into spritesheet
-    spritesheet.paste(new_img_resized, (x, y), new_img_resized)
     
-    # Save
-    spritesheet.save(spritesheet_path)
-    print(f"  ✓ Updated {spritesheet_path}")
-    return True
+    # Resize and paste in a single decode/encode of the spritesheet
+    job = BillboardJob(new_image_path, billboard_name, 'stretch')
+    return sheets_written(build_spritesheets([spritesheet_path], [job]))
 
 def main():
-    if len(sys.argv) < 7:
-        print("Usage: python integrate_billboards.py <image1> <billboard1> <image2> <billboard2> <image3> <billboard3>")
+    if len(sys.argv) < 3 or len(sys.argv) % 2 == 0:
+        print("Usage: python integrate_billboards.py <image1> <billboard1> [<image2> <billboard2> ...]")
         print("\nExample:")
         print("  python integrate_billboards.py invopay.png BILLBOARD01 arc.png BILLBOARD02 faucet.png BILLBOARD03")
         print("\nAvailable billboards:")
@@ -62,14 +40,11 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     
-    spritesheet_paths = [
-        os.path.join(project_root, 'game', 'assets', 'sprites.png'),
-        os.path.join(project_root, 'public', 'game', 'assets', 'images', 'sprites.png')
-    ]
+    spritesheet_paths = registered_spritesheets(project_root)
     
-    # Process 3 billboards
+    # Process every image/billboard pair
     updates = []
-    for i in range(1, 7, 2):
+    for i in range(1, len(sys.argv), 2):
         image_path = sys.argv[i]
         billboard_name = sys.argv[i + 1]
         
@@ -83,15 +58,16 @@ def main():
         
         updates.append((image_path, billboard_name))
     
-    # Update both spritesheet files
-    for spritesheet_path in spritesheet_paths:
-        if not os.path.exists(spritesheet_path):
-            print(f"Warning: {spritesheet_path} not found, skipping")
-            continue
-        
-        print(f"\nProcessing {spritesheet_path}...")
-        for image_path, billboard_name in updates:
-            update_spritesheet(spritesheet_path, image_path, billboard_name)
+    for image_path, billboard_name in updates:
+        if billboard_name not in BILLBOARDS:
+            print(f"Error: {billboard_name} not found. Available: {list(BILLBOARDS.keys())}")
+            return
+    
+    # Render all billboards once, then update both spritesheet files
+    # with a single decode/encode each
+    jobs = [BillboardJob(image_path, billboard_name, 'stretch') for image_path, billboard_name in updates]
+    if not sheets_written(build_spritesheets(spritesheet_paths, jobs)):
+        return
     
     print("\n✓ All billboards updated successfully!")
     print("  Remember to test the game to see the changes.")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Repack the sprite atlas from the individual PNGs in game/assets/sprites/
+Trims transparent borders of new sprites, MaxRects-packs every sprite into a
+minimal-area sheet and writes the sheet together with a regenerated SPRITES
+table
+Usage: python pack_atlas.py [--padding N] [--no-trim] [--prefer-files] [--output-dir DIR | --apply]
+"""
+
+from PIL import Image
+import argparse
+import math
+import os
+import numpy as np
+
+from compositing import pixel_diff
+from sheet_output import atomic_write, registered_spritesheets, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import format_table, sprite_table, write_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+SPRITES_DIR = os.path.join(PROJECT_ROOT, 'game', 'assets', 'sprites')
+DEFAULT_OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'packed')
+
+# Gap between sprites (and around the sheet) so scaled drawImage calls
+# don't sample neighbouring sprites
+DEFAULT_PADDING = 2
+# Candidate sheet widths are tried in steps of this many pixels, up to the
+# texture size every mobile GPU supports
+WIDTH_STEP = 8
+MAX_WIDTH = 2048
+
+def sprite_name(filename):
+    """SPRITES key of a sprite file: player_uphill_left.png -> PLAYER_UPHILL_LEFT"""
+    return os.path.splitext(filename)[0].upper()
+
+def trim(image):
+    """Crop transparent borders; returns (trimmed, (left, top, right, bottom) removed)"""
+    box = image.getchannel('A').getbbox()
+    if box is None:
+        return image.crop((0, 0, 1, 1)), (0, 0, image.width - 1, image.height - 1)
+    left, top, right, bottom = box
+    return image.crop(box), (left, top, image.width - right, image.height - bottom)
+
+def load_sprites(sprites_dir=SPRITES_DIR, spritesheet_path=None, prefer_files=False, trim_borders=True):
+    """Collect every sprite as {name: image}, in SPRITES table order, new sprites last
+
+    Sprites already in the table but without a file are cut from the current
+    sheet. When a file differs from the current sheet the sheet's version is
+    kept (sponsor billboards are only ever written into the sheet), unless
+    prefer_files.
+    Only new sprites are trimmed: the game draws table sprites at their full
+    size, so cropping them would shift and shrink them on screen.
+    """
+    table = sprite_table()
+    sheet = Image.open(spritesheet_path).convert('RGBA') if spritesheet_path else None
+    files = {sprite_name(f): os.path.join(sprites_dir, f)
+             for f in sorted(os.listdir(sprites_dir)) if f.lower().endswith('.png')}
+
+    sprites = {}
+    for name in list(table) + [name for name in files if name not in table]:
+        from_sheet = None
+        if sheet is not None and name in table:
+            x, y, w, h = table[name]
+            from_sheet = sheet.crop((x, y, x + w, y + h))
+        if name in files:
+            image = Image.open(files[name]).convert('RGBA')
+            if from_sheet is not None and (image.size != from_sheet.size
+                                           or pixel_diff(np.asarray(image), np.asarray(from_sheet))[0]):
+                if prefer_files:
+                    print(f"  ! {name}: {os.path.basename(files[name])} differs from the sheet, using the file")
+                else:
+                    image = from_sheet
+                    print(f"  ! {name}: {os.path.basename(files[name])} differs from the sheet, "
+                          f"keeping the sheet's version (use --prefer-files to use the file)")
+        elif from_sheet is not None:
+            image = from_sheet
+            print(f"  ! {name}: no file in {os.path.relpath(sprites_dir, PROJECT_ROOT)}, cut from the sheet")
+        else:
+            print(f"Warning: {name} has no file and no sheet to cut it from, skipping")
+            continue
+        if name in table:
+            sprites[name] = image
+            continue
+        print(f"  + {name}: new sprite")
+
+        if trim_borders:
+            trimmed, removed = trim(image)
+            if any(removed):
+                left, top, right, bottom = removed
+                print(f"  ✂ {name}: {image.width}x{image.height} → {trimmed.width}x{trimmed.height} "
+                      f"(trimmed left {left}, top {top}, right {right}, bottom {bottom})")
+            image = trimmed
+        sprites[name] = image
+    return sprites
+
+def _split_free(free, placed):
+    """Split free rectangles around a placed rectangle (MaxRects)"""
+    px, py, pw, ph = placed
+    result = []
+    for fx, fy, fw, fh in free:
+        if px >= fx + fw or px + pw <= fx or py >= fy + fh or py + ph <= fy:
+            result.append((fx, fy, fw, fh))
+            continue
+        if px > fx:
+            result.append((fx, fy, px - fx, fh))
+        if px + pw < fx + fw:
+            result.append((px + pw, fy, fx + fw - px - pw, fh))
+        if py > fy:
+            result.append((fx, fy, fw, py - fy))
+        if py + ph < fy + fh:
+            result.append((fx, py + ph, fw, fy + fh - py - ph))
+    # Drop rectangles contained in another one
+    pruned = []
+    for i, (ax, ay, aw, ah) in enumerate(result):
+        contained = False
+        for j, (bx, by, bw, bh) in enumerate(result):
+            if i != j and bx <= ax and by <= ay and ax + aw <= bx + bw and ay + ah <= by + bh:
+                if (ax, ay, aw, ah) != (bx, by, bw, bh) or i > j:
+                    contained = True
+                    break
+        if not contained:
+            pruned.append((ax, ay, aw, ah))
+    return pruned
+
+def maxrects_pack(sizes, width, padding):
+    """Pack (name, w, h) into a sheet of the given width, bottom-left heuristic
+
+    Returns ({name: (x, y)}, used height) or None when a sprite is wider than the sheet.
+    """
+    free = [(padding, padding, width - padding, 1 << 30)]
+    positions = {}
+    height = padding
+    for name, w, h in sizes:
+        pw, ph = w + padding, h + padding
+        best = None
+        for fx, fy, fw, fh in free:
+            if pw <= fw and ph <= fh:
+                score = (fy + ph, fx)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        if best is None:
+            return None
+        _, x, y = best
+        positions[name] = (x, y)
+        height = max(height, y + ph)
+        free = _split_free(free, (x, y, pw, ph))
+    return positions, height
+
+SORT_ORDERS = {
+    'height': lambda size: (-size[2], -size[1]),
+    'area': lambda size: (-size[1] * size[2], -size[2]),
+    'max-side': lambda size: (-max(size[1], size[2]), -size[2])
+}
+
+def pack(sprites, padding=DEFAULT_PADDING, width_step=WIDTH_STEP, max_width=MAX_WIDTH):
+    """Search sheet widths and sort orders for the smallest-area packing
+
+    Returns ({name: (x, y, w, h)}, (sheet_width, sheet_height)).
+    """
+    sizes = [(name, image.width, image.height) for name, image in sprites.items()]
+    area = sum((w + padding) * (h + padding) for _, w, h in sizes)
+    min_width = max(w for _, w, _ in sizes) + 2 * padding
+    start = max(min_width, int(math.sqrt(area)))
+    stop = max(start, min(max_width, 2 * int(math.sqrt(area))))
+    best = None
+    for width in range(start, stop + 1, width_step):
+        for order in SORT_ORDERS.values():
+            packed = maxrects_pack(sorted(sizes, key=order), width, padding)
+            if packed is None:
+                continue
+            positions, height = packed
+            used_width = max(positions[name][0] + w for name, w, _ in sizes) + padding
+            if best is None or used_width * height < best[0]:
+                best = (used_width * height, positions, (used_width, height))
+    _, positions, sheet_size = best
+    rects = {name: (*positions[name], sprites[name].width, sprites[name].height) for name in sprites}
+    return rects, sheet_size
+
+def render_atlas(sprites, rects, sheet_size):
+    """Paste every sprite at its packed position"""
+    atlas = Image.new('RGBA', sheet_size, (0, 0, 0, 0))
+    for name, (x, y, w, h) in rects.items():
+        atlas.paste(sprites[name], (x, y))
+    return atlas
+
+def main():
+    parser = argparse.ArgumentParser(description="Repack the sprite atlas and regenerate the SPRITES table")
+    parser.add_argument('--sprites-dir', default=SPRITES_DIR, help='directory of individual sprite PNGs')
+    parser.add_argument('--padding', type=int, default=DEFAULT_PADDING, help='gap between sprites in pixels')
+    parser.add_argument('--max-width', type=int, default=MAX_WIDTH, help='widest sheet to consider')
+    parser.add_argument('--no-trim', action='store_true', help='keep transparent borders of new sprites')
+    parser.add_argument('--prefer-files', action='store_true',
+                        help="use the file of sprites that differ from the current sheet, not the sheet's version")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help='where to write sprites.png and sprites.js for review')
+    parser.add_argument('--apply', action='store_true',
+                        help='write the sheet to every registered copy and rewrite every SPRITES table')
+    parser.add_argument('--optimize-png', action='store_true', help='search for the smallest PNG encoding')
+    args = parser.parse_args()
+
+    spritesheet_paths = registered_spritesheets(PROJECT_ROOT)
+    source_path = next((path for path in spritesheet_paths if os.path.exists(path)), None)
+    print("Loading sprites...")
+    sprites = load_sprites(args.sprites_dir, source_path, args.prefer_files, not args.no_trim)
+
+    rects, sheet_size = pack(sprites, args.padding, max_width=args.max_width)
+    atlas = render_atlas(sprites, rects, sheet_size)
+    used = sum(w * h for _, _, w, h in rects.values())
+    print(f"\nPacked {len(rects)} sprites into {sheet_size[0]}x{sheet_size[1]} "
+          f"({used / (sheet_size[0] * sheet_size[1]):.1%} filled)")
+    if source_path:
+        old = Image.open(source_path)
+        old_area = old.width * old.height
+        new_area = sheet_size[0] * sheet_size[1]
+        print(f"  Previous sheet: {old.width}x{old.height}, area {1 - new_area / old_area:.1%} smaller")
+
+    if args.apply:
+        save_spritesheet(atlas, [path for path in spritesheet_paths if os.path.exists(path)], args.optimize_png)
+        for path in write_table(rects):
+            print(f"  ✓ Updated SPRITES in {os.path.relpath(path, PROJECT_ROOT)}")
+        _, stale = write_bounds(np.asarray(atlas), rects)
+        if stale:
+            print(f"  ✓ Updated SPRITE_BOUNDS in {', '.join(stale)}")
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        save_spritesheet(atlas, [os.path.join(args.output_dir, 'sprites.png')], args.optimize_png)
+        table_path = os.path.join(args.output_dir, 'sprites.js')
+        atomic_write(table_path, (format_table('SPRITES', rects) + '\n').encode())
+        print(f"  ✓ Saved {table_path}")
+        print("\nReview the output, then rerun with --apply to update the game")
+
+    new = [name for name in rects if name not in sprite_table()]
+    if new:
+        print(f"\nNew sprites are in the table but not in any group: {', '.join(new)}")
+        print("  Add them to SPRITES.CARS/PLANTS/BILLBOARDS in game/common.js to use them in the game.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Non-rectangular content masks for framed billboards
+Segments the panel of a reference billboard by alpha and colour with
+vectorized connected components, so new content can be fitted and clipped to
+the panel instead of an axis-aligned rectangle
+Usage: python panel_mask.py [BILLBOARD ...] [--preview DIR]
+"""
+
+from PIL import Image
+import argparse
+import os
+import numpy as np
+
+from compositing import composite_over
+from frame_ops import border_boxes, content_box, detect_frame_insets
+from profiling import profiled
+from resize_cache import CACHE_DIR, cached_resize, image_hash
+
+MASK_CACHE_DIR = os.path.join(CACHE_DIR, 'masks')
+# Bump when the segmentation changes so cached masks are recomputed
+MASK_VERSION = 1
+
+# Posts and hangers narrower than twice this are cut off the board
+POST_RADIUS = 6
+# Max per-channel distance for a pixel to count as frame coloured
+COLOUR_TOLERANCE = 30
+# Frame-coloured pixels are peeled off the panel edge at most this deep
+MAX_PEEL = 12
+# The colour-segmented panel is only used when it keeps this much of the
+# inset board; panels the same colour as their frame (wood on wood) fall
+# back to the inset board shape
+MIN_PANEL_COVERAGE = 0.6
+
+def connected_components(mask):
+    """Label the 4-connected components of a boolean mask
+
+    Min-label propagation with pointer jumping, all in NumPy. Returns
+    (labels, count) with labels 0..count-1 and -1 for background.
+    """
+    height, width = mask.shape
+    sentinel = height * width
+    labels = np.where(mask, np.arange(sentinel).reshape(height, width), sentinel)
+    while True:
+        propagated = labels.copy()
+        np.minimum(propagated[1:], labels[:-1], out=propagated[1:])
+        np.minimum(propagated[:-1], labels[1:], out=propagated[:-1])
+        np.minimum(propagated[:, 1:], labels[:, :-1], out=propagated[:, 1:])
+        np.minimum(propagated[:, :-1], labels[:, 1:], out=propagated[:, :-1])
+        propagated[~mask] = sentinel
+        # Every label is the index of a pixel of the same component, so
+        # following labels twice shortcuts long chains
+        flat = propagated.ravel()
+        inside = flat < sentinel
+        for _ in range(2):
+            flat[inside] = flat[flat[inside]]
+        if np.array_equal(propagated, labels):
+            break
+        labels = propagated
+    roots, compact = np.unique(labels, return_inverse=True)
+    compact = compact.reshape(height, width)
+    count = len(roots) - (roots[-1] == sentinel if len(roots) else 0)
+    return np.where(mask, compact, -1), int(count)
+
+def largest_component(mask):
+    """The largest 4-connected component of a mask"""
+    labels, count = connected_components(mask)
+    if count == 0:
+        return mask.copy()
+    sizes = np.bincount(labels[labels >= 0], minlength=count)
+    return labels == int(np.argmax(sizes))
+
+def fill_holes(mask):
+    """Add every background region that doesn't touch the image border"""
+    labels, count = connected_components(~mask)
+    edge = np.unique(np.concatenate((labels[0], labels[-1], labels[:, 0], labels[:, -1])))
+    holes = (labels >= 0) & ~np.isin(labels, edge)
+    return mask | holes
+
+def box_erode(mask, top, right, bottom, left):
+    """Pixels whose box reaching top/right/bottom/left pixels away is all set
+
+    Uses a summed-area table, so the cost doesn't depend on the box size.
+    """
+    height, width = mask.shape
+    table = np.zeros((height + 1, width + 1), dtype=np.int32)
+    table[1:, 1:] = mask.cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+    ys, xs = np.arange(height), np.arange(width)
+    y0, y1 = ys - top, ys + bottom + 1
+    x0, x1 = xs - left, xs + right + 1
+    valid = ((y0 >= 0) & (y1 <= height))[:, None] & ((x0 >= 0) & (x1 <= width))[None, :]
+    y0, y1 = np.clip(y0, 0, height), np.clip(y1, 0, height)
+    x0, x1 = np.clip(x0, 0, width), np.clip(x1, 0, width)
+    area = table[y1][:, x1] - table[y0][:, x1] - table[y1][:, x0] + table[y0][:, x0]
+    return valid & (area == (top + bottom + 1) * (left + right + 1))
+
+def box_dilate(mask, radius):
+    """Pixels within radius (square) of a set pixel"""
+    return ~box_erode(~np.pad(mask, radius), radius, radius, radius, radius)[radius:-radius or None,
+                                                                              radius:-radius or None]
+
+def board_mask(rgba, radius=POST_RADIUS):
+    """Opaque silhouette of the sign board, without posts, hangers or holes"""
+    opaque = rgba[..., 3] >= 128
+    if radius > 0:
+        core = largest_component(box_erode(opaque, radius, radius, radius, radius))
+        if core.any():
+            opaque &= box_dilate(core, radius)
+    return fill_holes(largest_component(opaque))
+
+def frame_colour(rgba, insets):
+    """Median colour of the opaque pixels of the detected frame band"""
+    height, width = rgba.shape[:2]
+    pixels = np.concatenate([rgba[top:bottom, left:right].reshape(-1, 4)
+                             for left, top, right, bottom in border_boxes(width, height, insets)])
+    pixels = pixels[pixels[:, 3] >= 128]
+    if len(pixels) == 0:
+        return None
+    return np.median(pixels[:, :3], axis=0)
+
+@profiled
+def panel_mask(billboard, insets=None):
+    """Boolean (height, width) mask of the content panel of a reference billboard
+
+    The frame-inset rectangle is clipped to the board silhouette (alpha), so
+    transparent corners, arches and posts drop out. Frame-coloured pixels are
+    then peeled off its edge (colour), up to MAX_PEEL deep, so frame
+    structure reaching into the rectangle is left alone.
+    """
+    if billboard.mode != 'RGBA':
+        billboard = billboard.convert('RGBA')
+    if insets is None:
+        insets = detect_frame_insets(billboard)
+    rgba = np.asarray(billboard)
+    height, width = rgba.shape[:2]
+    left, top, right, bottom = content_box(width, height, insets)
+    inset = np.zeros((height, width), dtype=bool)
+    inset[top:bottom, left:right] = True
+    inset &= board_mask(rgba)
+    if not inset.any():
+        return inset
+
+    colour = frame_colour(rgba, insets)
+    if colour is None:
+        return inset
+    distance = np.abs(rgba[..., :3].astype(np.int16) - colour.astype(np.int16)).max(axis=2)
+    frame_coloured = (distance <= COLOUR_TOLERANCE) | (rgba[..., 3] < 128)
+    panel = inset
+    for _ in range(MAX_PEEL):
+        edge = panel & ~box_erode(panel, 1, 1, 1, 1)
+        peeled = edge & frame_coloured
+        if not peeled.any():
+            break
+        panel = panel & ~peeled
+    panel = fill_holes(largest_component(panel)) & inset
+    if panel.sum() < MIN_PANEL_COVERAGE * inset.sum():
+        return inset
+    return panel
+
+def mask_bounds(mask):
+    """(left, top, right, bottom) of the set pixels of a mask"""
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if len(rows) == 0:
+        return (0, 0, 0, 0)
+    return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+def cached_panel_mask(billboard):
+    """panel_mask of a reference, computed once per billboard hash
+
+    Frames from the frame library carry their mask; other masks are kept
+    as 1-bit PNGs under tools/.cache/masks.
+    """
+    if 'panel_mask' in billboard.info:
+        return billboard.info['panel_mask']
+    path = os.path.join(MASK_CACHE_DIR, f"{image_hash(billboard)}-v{MASK_VERSION}.png")
+    if os.path.exists(path):
+        try:
+            with Image.open(path) as cached:
+                return np.asarray(cached.convert('L')) > 0
+        except OSError:
+            pass
+    mask = panel_mask(billboard)
+    os.makedirs(MASK_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    Image.fromarray(mask).convert('1').save(tmp_path, format='PNG')
+    os.replace(tmp_path, path)
+    return mask
+
+@profiled
+def insert_into_panel(content_img, reference):
+    """Fit content to the panel of a reference billboard and clip it to the panel
+
+    Content is stretched to the panel's bounding box, its alpha is cut by the
+    mask and the result is composited over the reference in one pass.
+    """
+    mask = cached_panel_mask(reference)
+    left, top, right, bottom = mask_bounds(mask)
+    result = np.array(reference.convert('RGBA'))
+    if right <= left or bottom <= top:
+        return Image.fromarray(result, 'RGBA')
+    tile = np.array(cached_resize(content_img, (right - left, bottom - top), 'masked').convert('RGBA'))
+    tile[..., 3] = np.where(mask[top:bottom, left:right], tile[..., 3], 0)
+    composite_over(result, tile, left, top)
+    return Image.fromarray(result, 'RGBA')
+
+def main():
+    parser = argparse.ArgumentParser(description="Segment the content panel of the extracted billboards")
+    parser.add_argument('names', nargs='*', help='billboards to segment (default: all extracted)')
+    parser.add_argument('--preview', metavar='DIR', help='write each billboard with its panel tinted')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    extracted_dir = os.path.join(script_dir, 'extracted_billboards')
+    names = args.names or sorted(name[:-4] for name in os.listdir(extracted_dir)
+                                 if name.endswith('.png') and not name.endswith('.mask.png'))
+    if args.preview:
+        os.makedirs(args.preview, exist_ok=True)
+    for name in names:
+        billboard = Image.open(os.path.join(extracted_dir, f"{name}.png")).convert('RGBA')
+        insets = detect_frame_insets(billboard)
+        mask = panel_mask(billboard, insets)
+        left, top, right, bottom = mask_bounds(mask)
+        rect_area = (billboard.width - insets[1] - insets[3]) * (billboard.height - insets[0] - insets[2])
+        print(f"{name}: panel {int(mask.sum())} px in {right - left}x{bottom - top} at ({left}, {top}), "
+              f"inset rectangle {rect_area} px")
+        if args.preview:
+            preview = np.asarray(billboard).copy()
+            preview[mask, :3] = preview[mask, :3] // 2 + np.array([0, 127, 0], dtype=np.uint8)
+            Image.fromarray(preview, 'RGBA').save(os.path.join(args.preview, f"{name}.png"))
+
+if __name__ == "__main__":
+    main()
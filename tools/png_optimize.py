@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+PNG output optimizer for the spritesheets
+Tries a lossless palette when the sheet has 256 colours or fewer, an optional
+quantized palette within an error budget, and a search over PNG row filters
+and zlib levels/strategies; the smallest encoding wins
+Usage: python png_optimize.py sprites.png [--max-error E] [--output PATH | --in-place]
+"""
+
+from PIL import Image, features
+import argparse
+import io
+import os
+import struct
+import zlib
+import numpy as np
+
+from profiling import count, profiled
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+FILTERS = ('none', 'sub', 'up', 'average', 'paeth')
+STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+    'rle': zlib.Z_RLE
+}
+LEVELS = (9,)
+# Filters are ranked at this level, then the best SHORTLIST get the full search
+RANKING_LEVEL = 6
+SHORTLIST = 2
+# Quantized palettes tried, largest first, while they stay within the error budget
+PALETTE_SIZES = (256, 128, 64)
+
+def _chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+def filter_rows(pixels, bpp, method):
+    """PNG-filter a (height, row_bytes) uint8 array; returns filtered rows with filter-type bytes
+
+    method is one of FILTERS, or 'adaptive' to pick the filter per row by the
+    minimum sum of absolute differences heuristic from the PNG spec.
+    """
+    x = pixels.astype(np.int16)
+    a = np.zeros_like(x)
+    a[:, bpp:] = x[:, :-bpp]
+    b = np.zeros_like(x)
+    b[1:] = x[:-1]
+    c = np.zeros_like(x)
+    c[1:, bpp:] = x[:-1, :-bpp]
+
+    def residual(name):
+        if name == 'none':
+            return x
+        if name == 'sub':
+            return x - a
+        if name == 'up':
+            return x - b
+        if name == 'average':
+            return x - (a + b) // 2
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        return x - np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+    if method == 'adaptive':
+        residuals = np.stack([residual(name) for name in FILTERS]).astype(np.uint8)
+        # Sum of absolute values of the residuals read as signed bytes
+        scores = np.abs(residuals.view(np.int8).astype(np.int32)).sum(axis=2)
+        types = np.argmin(scores, axis=0).astype(np.uint8)
+        rows = residuals[types, np.arange(len(types))]
+    else:
+        types = np.full(len(x), FILTERS.index(method), dtype=np.uint8)
+        rows = residual(method).astype(np.uint8)
+    return np.concatenate([types[:, None], rows], axis=1)
+
+def encode_png_raw(pixels, color_type, filter_method='adaptive', level=9, strategy='default',
+                   palette=None, transparency=None, filtered=None):
+    """Encode 8-bit pixels as PNG bytes with an explicit filter and zlib setup
+
+    pixels is (height, width, 4) for RGBA (colour type 6) or (height, width)
+    palette indexes (colour type 3) with palette/transparency bytes.
+    """
+    height, width = pixels.shape[:2]
+    bpp = 4 if color_type == 6 else 1
+    if filtered is None:
+        filtered = filter_rows(pixels.reshape(height, width * bpp), bpp, filter_method)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, STRATEGIES[strategy])
+    idat = compressor.compress(filtered.tobytes()) + compressor.flush()
+    chunks = [_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))]
+    if color_type == 3:
+        chunks.append(_chunk(b'PLTE', palette))
+        if transparency:
+            chunks.append(_chunk(b'tRNS', transparency))
+    chunks.append(_chunk(b'IDAT', idat))
+    chunks.append(_chunk(b'IEND', b''))
+    return PNG_SIGNATURE + b''.join(chunks)
+
+def exact_palette(rgba):
+    """Palette indexes, PLTE and tRNS bytes for a sheet with <= 256 colours, else None"""
+    flat = np.ascontiguousarray(rgba).view(np.uint32).reshape(rgba.shape[:2])
+    colours, indexes = np.unique(flat, return_inverse=True)
+    if len(colours) > 256:
+        return None
+    entries = colours.view(np.uint8).reshape(-1, 4)
+    # Translucent entries first so tRNS can stop at the last one
+    order = np.argsort(entries[:, 3] == 255, kind='stable')
+    remap = np.empty(len(order), dtype=np.uint8)
+    remap[order] = np.arange(len(order), dtype=np.uint8)
+    entries = entries[order]
+    translucent = int((entries[:, 3] < 255).sum())
+    return (remap[indexes.reshape(flat.shape)], entries[:, :3].tobytes(),
+            entries[:translucent, 3].tobytes())
+
+def quantization_error(original, quantized):
+    """RMS error over premultiplied RGBA, so changes under transparent pixels don't count"""
+    def premultiplied(rgba):
+        rgba = rgba.astype(np.float32)
+        rgba[..., :3] *= rgba[..., 3:] / 255
+        return rgba
+    return float(np.sqrt(np.mean((premultiplied(original) - premultiplied(quantized)) ** 2)))
+
+def quantized_palette(image, colors):
+    """Quantize an RGBA image to at most colors entries"""
+    method = Image.Quantize.LIBIMAGEQUANT if features.check('libimagequant') else Image.Quantize.FASTOCTREE
+    return image.quantize(colors=colors, method=method, dither=Image.Dither.NONE)
+
+def _search(pixels, color_type, candidates, label, filters, **palette):
+    """Encode with the best filters and every zlib setup, returning the smallest (data, description)
+
+    Filters are ranked with a quick level-6 pass; only the SHORTLIST best go
+    through the full level/strategy search.
+    """
+    height, width = pixels.shape[:2]
+    bpp = 4 if color_type == 6 else 1
+    rows = pixels.reshape(height, width * bpp)
+    ranked = []
+    for filter_method in filters:
+        filtered = filter_rows(rows, bpp, filter_method)
+        ranked.append((len(zlib.compress(filtered.tobytes(), RANKING_LEVEL)), filter_method, filtered))
+    ranked.sort(key=lambda entry: entry[0])
+
+    best = None
+    for _, filter_method, filtered in ranked[:SHORTLIST]:
+        for strategy in STRATEGIES:
+            for level in LEVELS:
+                data = encode_png_raw(pixels, color_type, level=level, strategy=strategy,
+                                      filtered=filtered, **palette)
+                description = f"{label}, {filter_method} filter, zlib {strategy} level {level}"
+                candidates.append((len(data), description))
+                if best is None or len(data) < len(best[0]):
+                    best = (data, description)
+    return best
+
+@profiled
+def optimize_png(image, max_error=None, filters=FILTERS + ('adaptive',)):
+    """Smallest PNG encoding of image
+
+    Lossless candidates are always tried; a quantized palette is only
+    accepted when its error (see quantization_error) is <= max_error.
+    Returns (data, report) where report describes every candidate tried and
+    the error of the chosen one (0 when lossless).
+    """
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    rgba = np.asarray(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    baseline = buffer.getvalue()
+    candidates = [(len(baseline), 'Pillow default')]
+    results = [(baseline, 'Pillow default', 0.0)]
+
+    results.append((*_search(rgba, 6, candidates, 'RGBA', filters), 0.0))
+
+    exact = exact_palette(rgba)
+    if exact is not None:
+        indexes, plte, trns = exact
+        results.append((*_search(indexes, 3, candidates, f"lossless {len(plte) // 3}-colour palette",
+                                 ('none', 'adaptive'), palette=plte, transparency=trns), 0.0))
+    elif max_error is not None:
+        for colors in PALETTE_SIZES:
+            quantized = quantized_palette(image, colors).convert('RGBA')
+            error = quantization_error(rgba, np.asarray(quantized))
+            if error > max_error:
+                candidates.append((None, f"{colors}-colour palette rejected, error {error:.2f} > {max_error}"))
+                break
+            indexes, plte, trns = exact_palette(np.asarray(quantized))
+            results.append((*_search(indexes, 3, candidates, f"{colors}-colour palette (error {error:.2f})",
+                                     ('none', 'adaptive'), palette=plte, transparency=trns), error))
+
+    data, description, error = min(results, key=lambda result: len(result[0]))
+    count(bytes_encoded=len(data))
+    report = {
+        'chosen': description,
+        'bytes': len(data),
+        'baseline_bytes': len(baseline),
+        'saved_bytes': len(baseline) - len(data),
+        'error': error,
+        'candidates': candidates
+    }
+    return data, report
+
+def print_report(report):
+    saved = report['saved_bytes']
+    print(f"  PNG: {report['baseline_bytes']} → {report['bytes']} bytes "
+          f"({saved} saved, {saved / report['baseline_bytes']:.1%}) with {report['chosen']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the smallest PNG encoding of a spritesheet")
+    parser.add_argument('image', help='PNG to optimize')
+    parser.add_argument('--max-error', type=float, metavar='E',
+                        help='allow a quantized palette up to this RMS error (0-255 scale); lossless if unset')
+    parser.add_argument('--output', '-o', metavar='PATH', help='write the optimized PNG here')
+    parser.add_argument('--in-place', action='store_true', help='overwrite the input when smaller')
+    parser.add_argument('--verbose', '-v', action='store_true', help='list every candidate')
+    args = parser.parse_args()
+
+    image = Image.open(args.image)
+    data, report = optimize_png(image, args.max_error)
+    if args.verbose:
+        for size, description in report['candidates']:
+            print(f"  {size if size is not None else '-':>9}  {description}")
+    original_size = os.path.getsize(args.image)
+    print(f"{args.image}: {original_size} bytes on disk")
+    print_report(report)
+
+    output = args.image if args.in_place else args.output
+    if output:
+        if output == args.image and len(data) >= original_size:
+            print("  = Already optimal, left unchanged")
+            return
+        from sheet_output import atomic_write
+        atomic_write(output, data)
+        print(f"  ✓ Saved {output}")
+
+if __name__ == "__main__":
+    main()
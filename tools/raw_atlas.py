@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped raw working format for large spritesheets
+A small header plus the uncompressed RGBA pixels, kept under tools/.cache/atlas
+and opened with np.memmap. Billboard edits write straight into their rectangle
+of the mapping, so only the pages of those rows are touched; PNG encoding
+happens only when the sheet is exported
+Usage: python raw_atlas.py [info | refresh | export [--optimize-png] [--tiers LIST]] [--sheet PATH]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import numpy as np
+
+from atlas_tiers import export_tiers, parse_tiers
+from build_state import rebase_output_hash
+from compositing import buffer_image, decode_rgba
+from profiling import count, profiled
+from resize_cache import CACHE_DIR
+from sheet_output import file_hash, registered_spritesheets, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import sprite_group
+
+RAW_DIR = os.path.join(CACHE_DIR, 'atlas')
+MAGIC = b'RGBAATL2'
+# Magic, width, height, the SHA-256 hex of the PNG the pixels were decoded
+# from and whether they hold edits that were not exported to it yet
+HEADER = struct.Struct('<8sII64sI')
+# Source hash of an atlas that is still being built
+STALE = '0' * 64
+# Pixels start on a page boundary so each row maps to predictable pages
+DATA_OFFSET = 4096
+
+def raw_path(png_path, raw_dir=RAW_DIR):
+    """Working file of a sheet: sprites-<hash of its absolute path>.rgba"""
+    key = hashlib.sha256(os.path.abspath(png_path).encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(png_path))[0]
+    return os.path.join(raw_dir, f"{name}-{key}.rgba")
+
+def read_header(path):
+    """(width, height, source_hash, dirty) of a raw atlas, or None if missing or invalid"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, width, height, source_hash, dirty = HEADER.unpack(data)
+    if magic != MAGIC or os.path.getsize(path) != DATA_OFFSET + width * height * 4:
+        return None
+    return width, height, source_hash.decode('ascii'), bool(dirty)
+
+def write_header(path, width, height, source_hash, dirty=False):
+    with open(path, 'r+b') as f:
+        f.write(HEADER.pack(MAGIC, width, height, source_hash.encode('ascii'), int(dirty)))
+        f.flush()
+        os.fsync(f.fileno())
+
+def map_pixels(path, width, height):
+    """Writable (height, width, 4) mapping of a raw atlas's pixels"""
+    return np.memmap(path, dtype=np.uint8, mode='r+', offset=DATA_OFFSET, shape=(height, width, 4))
+
+@profiled
+def create_raw(png_path, path=None):
+    """Decode png_path straight into a new raw atlas and map it
+
+    The file is built under a temporary name and only gets the PNG's hash
+    once every row is written, so an interrupted run is never reused.
+    """
+    path = path or raw_path(png_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+
+    def allocate(width, height):
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, width, height, STALE.encode('ascii'), 0))
+            f.truncate(DATA_OFFSET + width * height * 4)
+        return map_pixels(temp_path, width, height)
+
+    count(bytes_decoded=os.path.getsize(png_path))
+    pixels = decode_rgba(png_path, allocate)
+    height, width = pixels.shape[:2]
+    pixels.flush()
+    del pixels
+    write_header(temp_path, width, height, file_hash(png_path))
+    os.replace(temp_path, path)
+    return map_pixels(path, width, height)
+
+def open_atlas(png_path, path=None, edit=False):
+    """Map the raw atlas of png_path, rebuilding it when the PNG changed since
+
+    With edit=True the header is marked dirty before the mapping is returned,
+    so pixels a caller is about to change are never taken for a pristine copy
+    of the PNG, even if the run is interrupted before the export.
+    """
+    path = path or raw_path(png_path)
+    header = read_header(path)
+    if header is not None and header[2] == file_hash(png_path):
+        width, height, source_hash, dirty = header
+        pixels = map_pixels(path, width, height)
+    else:
+        if header is not None and header[3]:
+            print(f"Warning: {png_path} changed since the raw atlas was edited; "
+                  f"its unexported edits are discarded")
+        pixels = create_raw(png_path, path)
+        height, width = pixels.shape[:2]
+        source_hash, dirty = file_hash(png_path), False
+    if edit and not dirty:
+        write_header(path, width, height, source_hash, dirty=True)
+    return pixels
+
+def mark_exported(pixels, png_path, exported, path=None):
+    """Record the PNG the mapped pixels now match, once an export succeeded
+
+    When png_path was not rewritten the atlas keeps its dirty flag, so its
+    edits are kept for the next export.
+    """
+    if not exported:
+        return
+    pixels.flush()
+    write_header(path or raw_path(png_path), pixels.shape[1], pixels.shape[0], file_hash(png_path))
+
+def same_file(path, paths):
+    """Whether path is one of paths"""
+    return os.path.abspath(path) in {os.path.abspath(other) for other in paths}
+
+def export_atlas(pixels, png_paths, tiers=(), **save_options):
+    """Encode the mapped pixels once for every PNG copy and tier, and refresh SPRITE_BOUNDS
+
+    This is the step billboard_batch defers with raw_atlas=True. Returns the
+    written paths.
+    """
+    pixels.flush()
+    spritesheet = buffer_image(pixels)
+    written, _ = save_spritesheet(spritesheet, png_paths, **save_options)
+    if tiers:
+        tier_written, _ = export_tiers(spritesheet, png_paths, tiers, **save_options)
+        written += tier_written
+    _, stale = write_bounds(pixels)
+    if stale:
+        print(f"  ✓ Updated SPRITE_BOUNDS in {', '.join(stale)}")
+    return written
+
+def touched_pages(width, rect, page_size=mmap.PAGESIZE):
+    """Number of pages an edit of rect writes in a raw atlas of the given width"""
+    x, y, w, h = rect
+    pages = set()
+    for row in range(y, y + h):
+        start = DATA_OFFSET + (row * width + x) * 4
+        pages.update(range(start // page_size, (start + w * 4 - 1) // page_size + 1))
+    return len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the memory-mapped raw working copy of the spritesheet")
+    parser.add_argument('command', nargs='?', choices=('info', 'refresh', 'export'), default='info')
+    parser.add_argument('--sheet', metavar='PATH', help='source PNG (default: first registered copy)')
+    parser.add_argument('--optimize-png', action='store_true', help='with export, search for the smallest PNG')
+    parser.add_argument('--tiers', type=parse_tiers, default=(), metavar='LIST',
+                        help='with export, also write downscaled sheets, e.g. 0.5,0.25')
+    args = parser.parse_args()
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    png_paths = [path for path in registered_spritesheets(project_root) if os.path.exists(path)]
+    source_path = args.sheet or (png_paths[0] if png_paths else None)
+    if source_path is None or not os.path.exists(source_path):
+        print("Error: no spritesheet found")
+        return
+    path = raw_path(source_path)
+
+    if args.command == 'info':
+        header = read_header(path)
+        if header is None:
+            print(f"{path}: no raw atlas yet (run 'refresh')")
+            return
+        width, height, source_hash, dirty = header
+        if source_hash != file_hash(source_path):
+            state = 'stale, rebuilt on next open'
+        elif dirty:
+            state = "has unexported edits, run 'export'"
+        else:
+            state = 'current'
+        print(f"{path}: {width}x{height}, {os.path.getsize(path) / 1024 / 1024:.1f} MB ({state})")
+        for name, rect in sprite_group('BILLBOARDS').items():
+            pages = touched_pages(width, rect)
+            print(f"  {name} {rect[2]}x{rect[3]}: {rect[2] * rect[3] * 4 / 1024:.0f} KB of pixels, "
+                  f"{pages} pages ({pages * mmap.PAGESIZE / 1024:.0f} KB)")
+        return
+
+    pixels = open_atlas(source_path, path)
+    print(f"  ✓ {path}: {pixels.shape[1]}x{pixels.shape[0]}")
+    if args.command == 'export':
+        previous_hash = file_hash(source_path)
+        export_atlas(pixels, png_paths, args.tiers, optimize=args.optimize_png)
+        exported = same_file(source_path, png_paths)
+        mark_exported(pixels, source_path, exported, path)
+        if exported:
+            # Incremental batch runs compare against the exported PNG from now on
+            rebase_output_hash(source_path, previous_hash, png_paths)
+
+if __name__ == "__main__":
+    main()
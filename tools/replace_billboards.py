@@ -7,13 +7,13 @@ Images will be resized/cropped to fit the billboard dimensions
 from PIL import Image
 import os
 
-# Billboard positions and dimensions
-BILLBOARDS = {
-    'BILLBOARD06': (488, 555, 298, 190),
-    'BILLBOARD07': (313, 897, 298, 190),
-    'BILLBOARD09': (150, 555, 328, 282)
-}
+from billboard_batch import (BILLBOARDS, BillboardJob, batch_options, build_spritesheets,
+                             parse_batch_args, sheets_written)
+from profiling import profiled
+from resize_cache import cached_resize
+from sheet_output import registered_spritesheets
 
+@profiled
 def resize_and_fit(image, target_width, target_height):
     """Resize image to fit target dimensions, maintaining aspect ratio and centering"""
     img_width, img_height = image.size
@@ -30,47 +30,36 @@ def resize_and_fit(image, target_width, target_height):
         new_width = int(target_height * img_ratio)
     
     # Resize image
-    resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    resized = cached_resize(image, (new_width, new_height), 'letterbox')
     
     # Create new image with target size and transparent background
     result = Image.new('RGBA', (target_width, target_height), (0, 0, 0, 0))
     
-    # Center the resized image
+    # Center the resized image; over a transparent canvas a plain copy is the
+    # exact composite (pasting with itself as mask would square its alpha)
     x_offset = (target_width - new_width) // 2
     y_offset = (target_height - new_height) // 2
-    result.paste(resized, (x_offset, y_offset), resized)
+    result.paste(resized, (x_offset, y_offset))
     
     return result
 
+@profiled
 def update_billboard(spritesheet_path, new_image_path, billboard_name):
     """Update a billboard in the spritesheet"""
     if billboard_name not in BILLBOARDS:
         print(f"Error: {billboard_name} not found")
         return False
     
-    # Open spritesheet
-    spritesheet = Image.open(spritesheet_path).convert('RGBA')
-    
-    # Open new image
-    new_img = Image.open(new_image_path).convert('RGBA')
     x, y, w, h = BILLBOARDS[billboard_name]
-    
     print(f"Processing {billboard_name}:")
     print(f"  Target size: {w}x{h}")
-    print(f"  Original image: {new_img.size[0]}x{new_img.size[1]}")
-    
-    # Resize and fit image
-    new_img_fitted = resize_and_fit(new_img, w, h)
     
-    # Paste into spritesheet
-    spritesheet.paste(new_img_fitted, (x, y), new_img_fitted)
-    
-    # Save
-    spritesheet.save(spritesheet_path)
-    print(f"  ✓ Updated {spritesheet_path}")
-    return True
+    # Resize, fit and paste in a single decode/encode of the spritesheet
+    job = BillboardJob(new_image_path, billboard_name, 'letterbox')
+    return sheets_written(build_spritesheets([spritesheet_path], [job]))
 
 def main():
+    args = parse_batch_args(__doc__)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     
@@ -83,10 +72,7 @@ def main():
         ('arc.png', 'BILLBOARD09')
     ]
     
-    spritesheet_paths = [
-        os.path.join(project_root, 'game', 'assets', 'sprites.png'),
-        os.path.join(project_root, 'public', 'game', 'assets', 'images', 'sprites.png')
-    ]
+    spritesheet_paths = registered_spritesheets(project_root)
     
     # Check if images exist
     for image_file, billboard_name in mappings:
@@ -95,20 +81,15 @@ def main():
             print(f"Error: Image not found: {image_path}")
             return
     
-    # Update both spritesheet files
-    for spritesheet_path in spritesheet_paths:
-        if not os.path.exists(spritesheet_path):
-            print(f"Warning: {spritesheet_path} not found, skipping")
-            continue
-        
-        print(f"\n{'='*60}")
-        print(f"Processing: {os.path.basename(spritesheet_path)}")
-        print(f"{'='*60}")
-        
-        for image_file, billboard_name in mappings:
-            image_path = os.path.join(script_dir, image_file)
-            update_billboard(spritesheet_path, image_path, billboard_name)
-            print()
+    # Render every billboard once, then update both spritesheet files
+    # with a single decode/encode each
+    jobs = [
+        BillboardJob(os.path.join(script_dir, image_file), billboard_name, 'letterbox')
+        for image_file, billboard_name in mappings
+    ]
+    if not sheets_written(build_spritesheets(spritesheet_paths, jobs, **batch_options(args))):
+        return
+    print()
     
     print("✓ All billboards updated successfully!")
     print("\nUpdated billboards:")
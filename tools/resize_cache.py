@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of resized billboard content
+Entries are keyed by source hash, target size, fit mode and resampling filter
+and stored as raw pixels under tools/.cache/resized with size-based LRU eviction
+"""
+
+from PIL import Image
+import hashlib
+import os
+
+from profiling import count, profiled
+
+CACHE_DIR = os.environ.get(
+    'BILLBOARD_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+RESIZE_CACHE_DIR = os.path.join(CACHE_DIR, 'resized')
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Oversized sources are shrunk with cheap integer box reductions (and JPEG
+# DCT scaling) until they are at most this many times the target, leaving
+# the rest to the high-quality resample
+REDUCING_GAP = 3.0
+# Modes Image.reduce works on directly; anything else is converted first
+REDUCIBLE_MODES = ('L', 'LA', 'RGB', 'RGBA')
+HASH_CHUNK = 1024 * 1024
+
+def image_hash(image):
+    """Hash of an image's source, preferring the file hash recorded at load time"""
+    if 'source_hash' in image.info:
+        return image.info['source_hash']
+    digest = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+def reduce_factor(size, target, gap=REDUCING_GAP):
+    """Largest integer shrink that keeps size at least gap x target in both dimensions"""
+    return max(1, int(min(size[0] / target[0], size[1] / target[1]) / gap))
+
+@profiled
+def open_hashed(path, target=None):
+    """Open an image as RGBA and record the hash of its file for cache keys
+
+    With target=(width, height), the size the image will be resampled to at
+    most, oversized sources are shrunk while loading: JPEGs decode straight
+    at a reduced DCT scale (draft mode) and the decoded pixels are box-reduced
+    by an integer factor, both stopping at REDUCING_GAP x target. The RGBA
+    conversion happens after the shrink, so time and memory stay close to
+    constant however large the source is.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        # Hashed in chunks so the encoded file isn't held during the decode
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    source_hash = digest.hexdigest()
+    count(bytes_decoded=os.path.getsize(path))
+    image = Image.open(path)
+    if target is not None:
+        original_size = image.size
+        image.draft('RGB', (int(target[0] * REDUCING_GAP), int(target[1] * REDUCING_GAP)))
+        factor = reduce_factor(image.size, target)
+        if factor > 1:
+            if image.mode not in REDUCIBLE_MODES:
+                has_alpha = 'A' in image.mode or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+            image = image.reduce(factor)
+        if image.size != original_size:
+            # A shrunk source resamples differently from the full one
+            source_hash = f"{source_hash}@{image.width}x{image.height}"
+    image = image.convert('RGBA')
+    image.info['source_hash'] = source_hash
+    return image
+
+def cache_key(source_hash, size, fit, resample):
+    """Cache key for one resize of one source"""
+    resample_name = Image.Resampling(resample).name
+    key = f"{source_hash}:{size[0]}x{size[1]}:{fit}:{resample_name}:{REDUCING_GAP}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def evict(max_bytes=MAX_CACHE_BYTES, cache_dir=RESIZE_CACHE_DIR):
+    """Remove least recently used entries until the cache fits in max_bytes"""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Removed by a concurrent worker
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+@profiled
+def cached_resize(image, size, fit='stretch', resample=Image.Resampling.LANCZOS, cache_dir=RESIZE_CACHE_DIR):
+    """Resize an image, reusing a cached result for the same source and target
+
+    Images more than REDUCING_GAP times the target are box-reduced first,
+    as in open_hashed, so in-memory sources get the same reduce-first path.
+    """
+    key = cache_key(image_hash(image), size, fit, resample)
+    path = os.path.join(cache_dir, f"{key}.{image.mode}.raw")
+
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            resized = Image.frombytes(image.mode, size, data)
+        except ValueError:
+            # Truncated or stale entry, rebuild it below
+            resized = None
+        if resized is not None:
+            # Touch the entry so LRU eviction keeps it
+            os.utime(path)
+            return resized
+
+    resized = image.resize(size, resample, reducing_gap=REDUCING_GAP)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(resized.tobytes())
+    os.replace(tmp_path, path)
+    evict(cache_dir=cache_dir)
+    return resized
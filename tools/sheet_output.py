@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Spritesheet output stage
+Encodes a composited sheet once and fans the bytes out to every registered
+copy with atomic renames, skipping copies that are already up to date.
+Optionally also exports WebP/AVIF next to each PNG, with a formats manifest
+"""
+
+from PIL import Image, features
+import hashlib
+import io
+import json
+import os
+import tempfile
+import numpy as np
+
+from png_optimize import optimize_png, print_report
+from profiling import count, profiled
+
+# Every copy of the spritesheet the game serves, relative to the project root
+SPRITESHEET_DESTINATIONS = [
+    os.path.join('game', 'assets', 'sprites.png'),
+    os.path.join('public', 'game', 'assets', 'images', 'sprites.png')
+]
+
+# Extra delivery formats written next to every PNG copy. WebP lossless keeps
+# the RGB of transparent pixels too; Pillow encodes AVIF through YUV, so its
+# round-trip error is measured and recorded in the manifest
+EXPORT_FORMATS = {
+    'webp': {
+        'format': 'WEBP',
+        'type': 'image/webp',
+        'options': {'lossless': True, 'quality': 100, 'method': 6, 'exact': True}
+    },
+    'avif': {
+        'format': 'AVIF',
+        'type': 'image/avif',
+        'options': {'quality': 100, 'subsampling': '4:4:4', 'speed': 6}
+    }
+}
+
+def registered_spritesheets(project_root):
+    """Absolute paths of every registered spritesheet copy"""
+    return [os.path.join(project_root, path) for path in SPRITESHEET_DESTINATIONS]
+
+def content_hash(data):
+    """SHA-256 hex digest of encoded bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def file_hash(path):
+    """SHA-256 hex digest of a file, or None if it doesn't exist"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return content_hash(f.read())
+
+@profiled
+def encode_png(image):
+    """Encode an image to PNG bytes"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    data = buffer.getvalue()
+    count(bytes_encoded=len(data))
+    return data
+
+@profiled
+def atomic_write(path, data):
+    """Write bytes to a temp file next to path, then rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def fan_out(data, destinations):
+    """Write encoded bytes to every destination whose content differs
+
+    Returns (written, skipped) lists of paths.
+    """
+    digest = content_hash(data)
+    written = []
+    skipped = []
+    for path in destinations:
+        if file_hash(path) == digest:
+            skipped.append(path)
+            print(f"  = Unchanged {path}")
+            continue
+        atomic_write(path, data)
+        written.append(path)
+        print(f"  ✓ Saved {path}")
+    return written, skipped
+
+def available_formats(formats, warn=True):
+    """Export formats that are known and have a codec in this Pillow build"""
+    available = []
+    for name in formats:
+        if name not in EXPORT_FORMATS:
+            if warn:
+                print(f"Warning: unknown export format {name}. Available: {list(EXPORT_FORMATS.keys())}")
+        elif not features.check(name):
+            if warn:
+                print(f"Warning: no {name} codec in this Pillow build, skipping")
+        else:
+            available.append(name)
+    return available
+
+def format_path(png_path, name):
+    """Path of an export format next to a PNG copy"""
+    return f"{os.path.splitext(png_path)[0]}.{name}"
+
+def manifest_path(png_path):
+    """Path of the formats manifest next to a PNG copy"""
+    return f"{os.path.splitext(png_path)[0]}.formats.json"
+
+def export_paths(png_paths, formats):
+    """Every file the export writes for the given PNG copies"""
+    if not formats:
+        return []
+    return [path for png_path in png_paths
+            for path in [format_path(png_path, name) for name in formats] + [manifest_path(png_path)]]
+
+@profiled
+def encode_format(image, name, reference=None):
+    """Encode an RGBA image in an export format
+
+    Returns (data, max_error), the largest channel difference after a round
+    trip from reference (default: image itself).
+    """
+    spec = EXPORT_FORMATS[name]
+    buffer = io.BytesIO()
+    image.save(buffer, format=spec['format'], **spec['options'])
+    data = buffer.getvalue()
+    count(bytes_encoded=len(data))
+    decoded = np.asarray(Image.open(io.BytesIO(data)).convert('RGBA'), dtype=np.int16)
+    reference = image if reference is None else reference
+    max_error = int(np.abs(decoded - np.asarray(reference, dtype=np.int16)).max())
+    return data, max_error
+
+def format_manifest(image, png_name, encoded):
+    """Manifest of every format of one sheet, smallest first
+
+    encoded maps format name to (data, max_error); the PNG is included as 'png'.
+    """
+    stem = os.path.splitext(png_name)[0]
+    entries = []
+    for name, (data, max_error) in encoded.items():
+        entries.append({
+            'format': name,
+            'file': png_name if name == 'png' else f"{stem}.{name}",
+            'type': 'image/png' if name == 'png' else EXPORT_FORMATS[name]['type'],
+            'bytes': len(data),
+            'sha256': content_hash(data),
+            'lossless': max_error == 0,
+            'max_error': max_error
+        })
+    entries.sort(key=lambda entry: entry['bytes'])
+    return {'width': image.width, 'height': image.height, 'formats': entries}
+
+@profiled
+def save_spritesheet(spritesheet, destinations, optimize=False, max_error=None, formats=()):
+    """Encode the spritesheet once and write it to every destination
+
+    optimize picks the smallest PNG encoding (see png_optimize), quantizing
+    to a palette when it stays within max_error. formats ('webp', 'avif')
+    are also written next to every copy, with a <name>.formats.json manifest.
+    """
+    if optimize:
+        data, report = optimize_png(spritesheet, max_error)
+        print_report(report)
+    else:
+        data, report = encode_png(spritesheet), None
+    written, skipped = fan_out(data, destinations)
+
+    formats = available_formats(formats)
+    if not formats or not destinations:
+        return written, skipped
+    if spritesheet.mode != 'RGBA':
+        spritesheet = spritesheet.convert('RGBA')
+    original = spritesheet
+    png_error = 0
+    # Every format carries the pixels the PNG ended up with, and errors are
+    # measured against the sheet before quantization
+    if report is not None and report['error'] > 0:
+        spritesheet = Image.open(io.BytesIO(data)).convert('RGBA')
+        png_error = int(np.abs(np.asarray(spritesheet, dtype=np.int16)
+                               - np.asarray(original, dtype=np.int16)).max())
+    encoded = {'png': (data, png_error)}
+    for name in formats:
+        encoded[name] = encode_format(spritesheet, name, original)
+        size, error = len(encoded[name][0]), encoded[name][1]
+        print(f"  {name.upper()}: {size} bytes ({size / len(data):.0%} of PNG)"
+              f"{'' if error == 0 else f', max channel error {error}'}")
+    # Copies that share a file name share a manifest
+    for png_name in sorted({os.path.basename(path) for path in destinations}):
+        copies = [path for path in destinations if os.path.basename(path) == png_name]
+        for name in formats:
+            result = fan_out(encoded[name][0], [format_path(path, name) for path in copies])
+            written += result[0]
+            skipped += result[1]
+        manifest = json.dumps(format_manifest(spritesheet, png_name, encoded), indent=2).encode()
+        result = fan_out(manifest, [manifest_path(path) for path in copies])
+        written += result[0]
+        skipped += result[1]
+    return written, skipped
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Opaque bounds and per-row coverage of every sprite
+One vectorized pass over the spritesheet finds, for every SPRITES entry, its
+tight opaque bounding box and the opaque column span of each of its rows, and
+writes them as the generated SPRITE_BOUNDS table. Render.sprite draws only the
+opaque box and Util.spriteSpan feeds Util.overlap the opaque columns instead
+of the padded sprite width. Rerun after the sheet or the SPRITES table changes
+Usage: python sprite_bounds.py [--sheet PATH] [--check]
+"""
+
+import argparse
+import os
+import numpy as np
+
+from compositing import decode_rgba
+from profiling import profiled
+from sheet_output import atomic_write, registered_spritesheets
+from sprite_registry import PROJECT_ROOT, sprite_table
+
+# Every copy of the generated table; game.html loads it before common.js
+BOUNDS_DESTINATIONS = [
+    os.path.join('game', 'assets', 'sprite_bounds.js'),
+    os.path.join('public', 'game', 'assets', 'sprite_bounds.js')
+]
+
+# Pixels with at least this alpha are drawn, so they count as opaque
+ALPHA_THRESHOLD = 1
+
+@profiled
+def sprite_bounds(sheet, table, threshold=ALPHA_THRESHOLD):
+    """Opaque box and per-row spans of every sprite of a (height, width, 4) sheet
+
+    Every opaque pixel is tagged with the sprite it belongs to and binned
+    by (sprite, row) in one pass, keeping the first and last opaque column.
+    Returns {name: ((x, y, w, h), spans)} relative to the sprite, where
+    spans is an (h, 2) array of [left, right) columns per row of the box,
+    (0, 0) for empty rows.
+    """
+    height, width = sheet.shape[:2]
+    names = list(table)
+    owner = np.full((height, width), -1, dtype=np.int32)
+    for index, name in enumerate(names):
+        x, y, w, h = table[name]
+        if (owner[y:y + h, x:x + w] >= 0).any():
+            raise ValueError(f"{name} overlaps another sprite")
+        owner[y:y + h, x:x + w] = index
+
+    rects = np.array([table[name] for name in names], dtype=np.int64).reshape(-1, 4)
+    # First row of every sprite in one table of rows for all sprites
+    row_base = np.concatenate(([0], np.cumsum(rects[:, 3])))
+    ys, xs = np.nonzero((sheet[..., 3] >= threshold) & (owner >= 0))
+    sprite = owner[ys, xs]
+    rows = row_base[sprite] + ys - rects[sprite, 1]
+    cols = xs - rects[sprite, 0]
+    left = np.full(row_base[-1], np.iinfo(np.int64).max, dtype=np.int64)
+    right = np.zeros(row_base[-1], dtype=np.int64)
+    np.minimum.at(left, rows, cols)
+    np.maximum.at(right, rows, cols + 1)
+
+    bounds = {}
+    for index, name in enumerate(names):
+        lefts = left[row_base[index]:row_base[index + 1]]
+        rights = right[row_base[index]:row_base[index + 1]]
+        filled = np.flatnonzero(rights > 0)
+        if len(filled) == 0:
+            bounds[name] = ((0, 0, 0, 0), np.zeros((0, 2), dtype=np.int64))
+            continue
+        top, bottom = int(filled[0]), int(filled[-1]) + 1
+        spans = np.stack((lefts[top:bottom], rights[top:bottom]), axis=1)
+        spans[spans[:, 1] == 0] = 0
+        box_left, box_right = int(spans[spans[:, 1] > 0, 0].min()), int(spans[:, 1].max())
+        bounds[name] = ((box_left, top, box_right - box_left, bottom - top), spans)
+    return bounds
+
+def run_lengths(spans):
+    """Flat [count, left, right, ...] runs of identical consecutive row spans"""
+    if len(spans) == 0:
+        return []
+    starts = np.flatnonzero(np.concatenate(([True], (spans[1:] != spans[:-1]).any(axis=1))))
+    counts = np.diff(np.append(starts, len(spans)))
+    return [int(value) for start, n in zip(starts, counts) for value in (n, *spans[start])]
+
+def format_bounds(table, bounds):
+    """JS source of the generated SPRITE_BOUNDS table
+
+    Every entry keeps the sprite size it was measured at, so common.js can
+    skip bounds that no longer match the SPRITES table.
+    """
+    width = max(len(name) for name in bounds) + 1
+    lines = []
+    for name, ((x, y, w, h), spans) in bounds.items():
+        runs = ','.join(str(value) for value in run_lengths(spans))
+        lines.append(f"  {name + ':':<{width}} {{ sw: {table[name][2]:4d}, sh: {table[name][3]:4d}, "
+                     f"x: {x:4d}, y: {y:4d}, w: {w:4d}, h: {h:4d}, rows: [{runs}] }}")
+    return ("// Generated by tools/sprite_bounds.py from the spritesheet - do not edit.\n"
+            "// Opaque box (x, y, w, h) of every sprite relative to the sprite, and the opaque\n"
+            "// [left, right) columns of each row of that box as [rows, left, right, ...] runs\n"
+            "var SPRITE_BOUNDS = {\n" + ",\n".join(lines) + "\n};\n")
+
+def write_bounds(sheet, table=None, project_root=PROJECT_ROOT, check=False):
+    """Regenerate every copy of SPRITE_BOUNDS from a (height, width, 4) sheet
+
+    Returns (bounds, stale), stale being the copies that were out of date;
+    with check=True they are only reported, not rewritten.
+    """
+    table = table or sprite_table('SPRITES', project_root)
+    bounds = sprite_bounds(sheet, table)
+    source = format_bounds(table, bounds)
+    stale = []
+    for destination in BOUNDS_DESTINATIONS:
+        path = os.path.join(project_root, destination)
+        if os.path.exists(path):
+            with open(path) as f:
+                if f.read() == source:
+                    continue
+        stale.append(destination)
+        if not check:
+            atomic_write(path, source.encode())
+    return bounds, stale
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the opaque bounds of every sprite")
+    parser.add_argument('--sheet', metavar='PATH', help='spritesheet to measure (default: first registered copy)')
+    parser.add_argument('--check', action='store_true', help='only report whether the generated table is current')
+    args = parser.parse_args()
+
+    sheet_path = args.sheet or next((path for path in registered_spritesheets(PROJECT_ROOT)
+                                     if os.path.exists(path)), None)
+    if sheet_path is None or not os.path.exists(sheet_path):
+        print("Error: no spritesheet found")
+        return
+    table = sprite_table('SPRITES')
+    bounds, stale = write_bounds(decode_rgba(sheet_path), table, check=args.check)
+
+    full_area = sum(w * h for _, _, w, h in table.values())
+    box_area = sum(w * h for (_, _, w, h), _ in bounds.values())
+    print(f"{len(bounds)} sprites: {box_area} of {full_area} source pixels drawn "
+          f"({100 * (1 - box_area / full_area):.0f}% transparent padding skipped)")
+    for name, ((x, y, w, h), spans) in bounds.items():
+        sw, sh = table[name][2:]
+        if (w, h) != (sw, sh):
+            print(f"  {name}: {sw}x{sh} → {w}x{h} at ({x}, {y})")
+    for destination in BOUNDS_DESTINATIONS:
+        if destination not in stale:
+            print(f"  = {destination} is current")
+        elif args.check:
+            print(f"  ✗ {destination} is out of date")
+        else:
+            print(f"  ✓ Wrote {destination}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Sprite coordinate registry parsed from the game's JS tables
+game/common.js is authoritative (it is what game.html loads); entries only
+found in game/assets/sprites.js or game/assets/background.js are added from there
+Usage: python sprite_registry.py [NAME_OR_GROUP ...]
+"""
+
+import json
+import os
+import re
+import sys
+
+from resize_cache import CACHE_DIR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Parsed in order; later files override earlier ones
+SOURCES = [
+    os.path.join('game', 'assets', 'sprites.js'),
+    os.path.join('game', 'assets', 'background.js'),
+    os.path.join('game', 'common.js')
+]
+
+# Every copy of the SPRITES table the game serves; they are kept identical
+TABLE_DESTINATIONS = [
+    os.path.join('game', 'common.js'),
+    os.path.join('game', 'assets', 'sprites.js'),
+    os.path.join('public', 'game', 'common.js'),
+    os.path.join('public', 'game', 'assets', 'sprites.js')
+]
+
+CACHE_PATH = os.path.join(CACHE_DIR, 'sprite_registry.json')
+
+TABLE_RE = re.compile(r'var\s+(\w+)\s*=\s*\{(.*?)\n\};', re.DOTALL)
+ENTRY_RE = re.compile(r'(\w+)\s*:\s*\{\s*x\s*:\s*(\d+)\s*,\s*y\s*:\s*(\d+)\s*,\s*w\s*:\s*(\d+)\s*,\s*h\s*:\s*(\d+)\s*[^}]*\}')
+GROUP_RE = re.compile(r'(\w+)\.(\w+)\s*=\s*\[(.*?)\];', re.DOTALL)
+MEMBER_RE = re.compile(r'(\w+)\.(\w+)')
+
+_registries = {}
+
+def parse_js_tables(source):
+    """Parse coordinate tables and group arrays out of JS source
+
+    Returns ({table: {name: (x, y, w, h)}}, {group: [names]}).
+    """
+    tables = {}
+    for table_name, body in TABLE_RE.findall(source):
+        entries = {name: tuple(int(v) for v in rect) for name, *rect in ENTRY_RE.findall(body)}
+        if entries:
+            tables[table_name] = entries
+    groups = {}
+    for table_name, group_name, body in GROUP_RE.findall(source):
+        members = [name for owner, name in MEMBER_RE.findall(body) if owner == table_name]
+        if members:
+            groups[group_name] = members
+    return tables, groups
+
+def _source_stamp(paths):
+    """mtime/size stamp of every source file, used as the cache key"""
+    stamp = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            stamp.append([path, stat.st_mtime_ns, stat.st_size])
+    return stamp
+
+def _read_disk_cache(stamp):
+    if not os.path.exists(CACHE_PATH):
+        return None
+    try:
+        with open(CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('stamp') != stamp:
+        return None
+    tables = {t: {n: tuple(r) for n, r in entries.items()} for t, entries in cached['tables'].items()}
+    return {'tables': tables, 'groups': cached['groups']}
+
+def _write_disk_cache(stamp, registry):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'stamp': stamp, **registry}, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+def load_registry(project_root=PROJECT_ROOT):
+    """Load the sprite registry, re-parsing only when a source file changed
+
+    Returns {'tables': {table: {name: (x, y, w, h)}}, 'groups': {group: [names]}}.
+    """
+    paths = [os.path.join(project_root, source) for source in SOURCES]
+    stamp = _source_stamp(paths)
+    key = json.dumps(stamp)
+    if key in _registries:
+        return _registries[key]
+
+    registry = _read_disk_cache(stamp)
+    if registry is None:
+        tables = {}
+        groups = {}
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path) as f:
+                file_tables, file_groups = parse_js_tables(f.read())
+            for table_name, entries in file_tables.items():
+                table = tables.setdefault(table_name, {})
+                for name, rect in entries.items():
+                    if name in table and table[name] != rect:
+                        print(f"Warning: {table_name}.{name} differs in {os.path.relpath(path, project_root)}: "
+                              f"{rect} overrides {table[name]}")
+                    table[name] = rect
+            groups.update(file_groups)
+        registry = {'tables': tables, 'groups': groups}
+        _write_disk_cache(stamp, registry)
+
+    _registries[key] = registry
+    return registry
+
+def sprite_table(table_name='SPRITES', project_root=PROJECT_ROOT):
+    """All entries of a coordinate table as {name: (x, y, w, h)}"""
+    return dict(load_registry(project_root)['tables'].get(table_name, {}))
+
+def sprite_rect(name, table_name='SPRITES', project_root=PROJECT_ROOT):
+    """(x, y, w, h) of a single sprite"""
+    table = load_registry(project_root)['tables'].get(table_name, {})
+    if name not in table:
+        raise KeyError(f"{name} not found in {table_name}. Available: {list(table.keys())}")
+    return table[name]
+
+def sprite_group(group_name, table_name='SPRITES', project_root=PROJECT_ROOT):
+    """Entries of a group (BILLBOARDS, PLANTS, CARS) as {name: (x, y, w, h)}, in group order"""
+    registry = load_registry(project_root)
+    if group_name not in registry['groups']:
+        raise KeyError(f"Group {group_name} not found. Available: {list(registry['groups'].keys())}")
+    table = registry['tables'].get(table_name, {})
+    return {name: table[name] for name in registry['groups'][group_name] if name in table}
+
+def format_table(table_name, entries, extra=None):
+    """JS source of a coordinate table in the layout used by common.js
+
+    extra optionally adds fields after x/y/w/h, as {name: {field: value}}.
+    """
+    extra = extra or {}
+    width = max(len(name) for name in entries) + 1
+    lines = []
+    for name, (x, y, w, h) in entries.items():
+        fields = ''.join(f", {field}: {value:4d}" for field, value in extra.get(name, {}).items())
+        lines.append(f"  {name + ':':<{width}} {{ x: {x:4d}, y: {y:4d}, w: {w:4d}, h: {h:4d}{fields} }}")
+    return f"var {table_name} = {{\n" + ",\n".join(lines) + "\n};"
+
+def replace_table(source, table_name, entries, extra=None):
+    """JS source with the named table replaced by entries"""
+    pattern = re.compile(r'var\s+' + table_name + r'\s*=\s*\{.*?\n\};', re.DOTALL)
+    if not pattern.search(source):
+        raise KeyError(f"Table {table_name} not found")
+    return pattern.sub(lambda match: format_table(table_name, entries, extra), source, count=1)
+
+def write_table(entries, table_name='SPRITES', project_root=PROJECT_ROOT, destinations=TABLE_DESTINATIONS,
+                extra=None):
+    """Rewrite a coordinate table in every JS copy that has it; returns the written paths"""
+    from sheet_output import atomic_write
+    written = []
+    for destination in destinations:
+        path = os.path.join(project_root, destination)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            source = f.read()
+        updated = replace_table(source, table_name, entries, extra)
+        if updated != source:
+            atomic_write(path, updated.encode())
+            written.append(path)
+    return written
+
+def main():
+    registry = load_registry()
+    names = sys.argv[1:]
+    if not names:
+        for table_name, entries in registry['tables'].items():
+            print(f"{table_name}: {len(entries)} entries")
+        for group_name, members in registry['groups'].items():
+            print(f"  {group_name}: {', '.join(members)}")
+        return
+    for name in names:
+        if name in registry['groups']:
+            entries = sprite_group(name)
+        elif name in registry['tables']:
+            entries = sprite_table(name)
+        else:
+            entries = {name: sprite_rect(name)}
+        for entry_name, (x, y, w, h) in entries.items():
+            print(f"  {entry_name}: {w}x{h} at ({x}, {y})")
+
+if __name__ == "__main__":
+    main()
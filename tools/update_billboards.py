@@ -8,19 +8,10 @@ from PIL import Image
 import sys
 import os
 
-# Billboard positions and dimensions
-BILLBOARDS = {
-    'BILLBOARD01': (625, 375, 300, 170),
-    'BILLBOARD02': (245, 1262, 215, 220),
-    'BILLBOARD03': (5, 1262, 230, 220),
-    'BILLBOARD04': (1205, 310, 268, 170),
-    'BILLBOARD05': (5, 897, 298, 190),
-    'BILLBOARD06': (488, 555, 298, 190),
-    'BILLBOARD07': (313, 897, 298, 190),
-    'BILLBOARD08': (230, 5, 385, 265),
-    'BILLBOARD09': (150, 555, 328, 282)
-}
+from billboard_batch import BILLBOARDS, BillboardJob, build_spritesheets, sheets_written
+from profiling import profiled
 
+@profiled
 def extract_billboard(spritesheet_path, billboard_name, output_path):
     """Extract a billboard from the spritesheet for inspection"""
     img = Image.open(spritesheet_path)
@@ -29,24 +20,13 @@ def extract_billboard(spritesheet_path, billboard_name, output_path):
     billboard.save(output_path)
     print(f"Extracted {billboard_name} to {output_path}")
 
+@profiled
 def update_billboard(spritesheet_path, new_image_path, billboard_name, output_path):
     """Replace a billboard in the spritesheet with a new image"""
-    # Open spritesheet
-    spritesheet = Image.open(spritesheet_path).convert('RGBA')
-    
-    # Open and resize new image
-    new_img = Image.open(new_image_path).convert('RGBA')
-    x, y, w, h = BILLBOARDS[billboard_name]
-    
-    # Resize new image to fit billboard dimensions
-    new_img_resized = new_img.resize((w, h), Image.Resampling.LANCZOS)
-    
-    # Paste into spritesheet
-    spritesheet.paste(new_img_resized, (x, y), new_img_resized)
-    
-    # Save
-    spritesheet.save(output_path)
-    print(f"Updated {billboard_name} in {output_path}")
+    # Resize and paste in a single decode/encode of the spritesheet
+    job = BillboardJob(new_image_path, billboard_name, 'stretch')
+    if sheets_written(build_spritesheets([spritesheet_path], [job], [output_path])):
+        print(f"Updated {billboard_name} in {output_path}")
 
 def main():
     if len(sys.argv) < 2:
@@ -84,13 +64,11 @@ def main():
         if not os.path.exists(new_image_path):
             print(f"Error: {new_image_path} not found")
             return
-        output_path = spritesheet_path
-        update_billboard(spritesheet_path, new_image_path, billboard_name, output_path)
-        # Also update the public version
+        # Update the game and public versions, rendering the billboard once
         public_path = "../public/game/assets/images/sprites.png"
-        if os.path.exists(public_path):
-            update_billboard(public_path, new_image_path, billboard_name, public_path)
-            print(f"Also updated {public_path}")
+        job = BillboardJob(new_image_path, billboard_name, 'stretch')
+        for path in build_spritesheets([spritesheet_path, public_path], [job]) or []:
+            print(f"Updated {billboard_name} in {path}")
     
     else:
         print(f"Unknown command: {command}")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Drift check between the atlas copies and the standalone sprites
+Hashes every SPRITES region of every sprites*.png copy and every file in the
+sprites/ directories (cached by file stamp), compares the hashes against the
+reference sheet and only decodes and diffs, vectorized and in parallel, the
+regions whose hashes differ. Exits non-zero on drift so it can run as a
+commit hook; --resync brings the files or the sheets back in line
+Usage: python verify_sprites.py [--tolerance N] [--resync files|sheet]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import argparse
+import hashlib
+import json
+import os
+import sys
+import numpy as np
+
+from compositing import buffer_image, decode_rgba, pixel_diff
+from pack_atlas import sprite_name
+from png_optimize import optimize_png
+from resize_cache import CACHE_DIR
+from sheet_output import SPRITESHEET_DESTINATIONS, atomic_write, file_hash, save_spritesheet
+from sprite_bounds import write_bounds
+from sprite_registry import PROJECT_ROOT, sprite_table
+
+# Directories holding copies of the atlas; every sprites*.png in them is checked
+ATLAS_DIRS = [
+    os.path.join('game', 'assets'),
+    os.path.join('game', 'assets', 'images'),
+    os.path.join('public', 'game', 'assets'),
+    os.path.join('public', 'game', 'assets', 'images')
+]
+# Standalone sprites; the first directory is the one pack_atlas reads
+SPRITE_DIRS = [
+    os.path.join('game', 'assets', 'sprites'),
+    os.path.join('public', 'game', 'assets', 'sprites')
+]
+CACHE_PATH = os.path.join(CACHE_DIR, 'verify_sprites.json')
+
+# Largest per-channel difference still counted as equal
+DEFAULT_TOLERANCE = 0
+
+def is_stray(path):
+    """Whether an atlas copy is one the game never loads (e.g. "sprites copy.png")"""
+    return os.path.basename(path) != 'sprites.png'
+
+def atlas_copies(project_root=PROJECT_ROOT):
+    """Every sprites*.png in the atlas directories, registered copies first"""
+    registered = [os.path.join(project_root, path) for path in SPRITESHEET_DESTINATIONS]
+    found = []
+    for directory in ATLAS_DIRS:
+        path = os.path.join(project_root, directory)
+        if os.path.isdir(path):
+            found += [os.path.join(path, f) for f in sorted(os.listdir(path))
+                      if f.startswith('sprites') and f.lower().endswith('.png')]
+    return [path for path in registered if path in found] + [path for path in found if path not in registered]
+
+def sprite_files(project_root=PROJECT_ROOT):
+    """{path: SPRITES name} of every standalone sprite"""
+    files = {}
+    for directory in SPRITE_DIRS:
+        path = os.path.join(project_root, directory)
+        if os.path.isdir(path):
+            files.update({os.path.join(path, f): sprite_name(f)
+                          for f in sorted(os.listdir(path)) if f.lower().endswith('.png')})
+    return files
+
+def pixel_hash(rgba):
+    """Hash of RGBA pixels; colour under fully transparent pixels is ignored"""
+    rgba = np.where(rgba[..., 3:] > 0, rgba, 0).astype(np.uint8)
+    return hashlib.sha256(np.ascontiguousarray(rgba).tobytes()).hexdigest()
+
+def load_rgba(path):
+    """(height, width, 4) pixels of any PNG (palette, interlaced, 16-bit)"""
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGBA'))
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def _load_cache(path=CACHE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def file_digest(path, cached):
+    """{'stamp': ..., 'digest': file hash}, rehashing the bytes only when the stamp changed"""
+    stamp = _stamp(path)
+    if cached.get('stamp') == stamp:
+        return cached
+    return {'stamp': stamp, 'digest': file_hash(path)}
+
+def hash_atlas(path, table, cached):
+    """{name: [rect, hash]} of every region; cached holds the regions last hashed for these bytes"""
+    regions = dict(cached)
+    missing = {name: rect for name, rect in table.items()
+               if name not in regions or regions[name][0] != list(rect)}
+    if missing:
+        sheet = decode_rgba(path)
+        for name, (x, y, w, h) in missing.items():
+            region = sheet[y:y + h, x:x + w]
+            regions[name] = [[x, y, w, h], pixel_hash(region) if region.shape[:2] == (h, w) else None]
+    return regions
+
+def hash_sprite(path, cached):
+    """{'size': [w, h], 'hash': ...} of a standalone sprite"""
+    stamp = _stamp(path)
+    if cached.get('stamp') == stamp:
+        return cached
+    rgba = load_rgba(path)
+    return {'stamp': stamp, 'size': [rgba.shape[1], rgba.shape[0]], 'hash': pixel_hash(rgba)}
+
+def verify(table, tolerance=DEFAULT_TOLERANCE, project_root=PROJECT_ROOT, workers=8):
+    """Compare every atlas copy and standalone sprite against the reference sheet
+
+    Returns (reference path, mismatches, notes). Every mismatch is a dict
+    with kind ('atlas' or 'sprite'), path, name and either pixels/max_diff
+    or a size description.
+    """
+    atlases = atlas_copies(project_root)
+    if not atlases:
+        raise FileNotFoundError("no spritesheet found")
+    files = sprite_files(project_root)
+    cache = _load_cache()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = dict(zip(atlases, pool.map(
+            lambda path: file_digest(path, cache.get('atlases', {}).get(path, {})), atlases)))
+        # Copies with identical bytes are decoded and hashed once
+        unique = {digests[path]['digest']: path for path in reversed(atlases)}
+        cached_regions = cache.get('regions', {})
+        region_hashes = dict(zip(unique, pool.map(
+            lambda digest: hash_atlas(unique[digest], table, cached_regions.get(digest, {})), unique)))
+        sprite_hashes = dict(zip(files, pool.map(
+            lambda path: hash_sprite(path, cache.get('sprites', {}).get(path, {})), files)))
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    atomic_write(CACHE_PATH, json.dumps({'atlases': digests, 'regions': region_hashes,
+                                         'sprites': sprite_hashes}).encode())
+    atlas_hashes = {path: region_hashes[digests[path]['digest']] for path in atlases}
+
+    reference = atlases[0]
+    expected = {name: entry[1] for name, entry in atlas_hashes[reference].items()}
+    notes = []
+    suspects = []
+    for path in atlases[1:]:
+        differing = [name for name in table if atlas_hashes[path][name][1] != expected[name]]
+        if is_stray(path):
+            # Reported, but never fails the check or gets resynced
+            notes.append(f"{os.path.relpath(path, project_root)} is a stray copy the game never loads"
+                         + (f" ({len(differing)} regions differ)" if differing else ""))
+            continue
+        suspects += [('atlas', path, name) for name in differing]
+    for path, name in files.items():
+        if name not in table:
+            notes.append(f"{os.path.relpath(path, project_root)}: {name} is not in SPRITES "
+                         f"(add it with atlas_insert.py)")
+            continue
+        w, h = table[name][2:]
+        entry = sprite_hashes[path]
+        if entry['size'] != [w, h]:
+            suspects.append(('size', path, name))
+        elif entry['hash'] != expected[name]:
+            suspects.append(('sprite', path, name))
+    for name in table:
+        if name not in files.values():
+            notes.append(f"{name} has no standalone file")
+
+    if not suspects:
+        return reference, [], notes
+    # Only the files behind differing hashes are decoded
+    paths = sorted({reference} | {path for kind, path, _ in suspects if kind != 'size'})
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        decoded = dict(zip(paths, pool.map(lambda path: decode_rgba(path) if path in atlases else load_rgba(path),
+                                           paths)))
+    sheet = decoded[reference]
+    mismatches = []
+    for kind, path, name in suspects:
+        x, y, w, h = table[name]
+        if kind == 'size':
+            size = sprite_hashes[path]['size']
+            mismatches.append({'kind': 'sprite', 'path': path, 'name': name,
+                               'size': f"{size[0]}x{size[1]}, atlas region is {w}x{h}"})
+            continue
+        pixels = decoded[path][y:y + h, x:x + w] if kind == 'atlas' else decoded[path]
+        count, max_diff = pixel_diff(pixels, sheet[y:y + h, x:x + w], tolerance)
+        if count:
+            mismatches.append({'kind': kind, 'path': path, 'name': name, 'pixels': count, 'max_diff': max_diff})
+    return reference, mismatches, notes
+
+def resync_files(sheet, table, mismatches, reference):
+    """Rewrite drifted sprites from the reference sheet and drifted atlas copies with its bytes"""
+    with open(reference, 'rb') as f:
+        data = f.read()
+    for path in sorted({m['path'] for m in mismatches if m['kind'] == 'atlas'}):
+        atomic_write(path, data)
+        print(f"  ✓ Rewrote {os.path.relpath(path, PROJECT_ROOT)} from the reference sheet")
+    for mismatch in mismatches:
+        if mismatch['kind'] != 'sprite':
+            continue
+        x, y, w, h = table[mismatch['name']]
+        # Lossless; sprites that fit a palette stay palettized
+        data, _ = optimize_png(Image.fromarray(np.ascontiguousarray(sheet[y:y + h, x:x + w]), 'RGBA'))
+        atomic_write(mismatch['path'], data)
+        print(f"  ✓ Rewrote {os.path.relpath(mismatch['path'], PROJECT_ROOT)} from the sheet")
+
+def resync_sheet(sheet, table, mismatches, atlases):
+    """Paste drifted standalone sprites into the sheet and rewrite every sprites.png copy"""
+    primary = os.path.join(PROJECT_ROOT, SPRITE_DIRS[0])
+    sources = {}
+    for mismatch in mismatches:
+        if mismatch['kind'] != 'sprite':
+            continue
+        if 'size' in mismatch:
+            print(f"Warning: {mismatch['name']} is {mismatch['size']}; repack with pack_atlas.py instead")
+            continue
+        # The development copy wins when both sprite directories drifted
+        if mismatch['name'] not in sources or os.path.dirname(mismatch['path']) == primary:
+            sources[mismatch['name']] = mismatch['path']
+    sheet = sheet.copy()
+    for name, path in sources.items():
+        x, y, w, h = table[name]
+        sheet[y:y + h, x:x + w] = load_rgba(path)
+        print(f"  + {name} from {os.path.relpath(path, PROJECT_ROOT)}")
+    save_spritesheet(buffer_image(sheet), [path for path in atlases if not is_stray(path)])
+    write_bounds(sheet, table)
+    return sheet
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the atlas copies and standalone sprites for drift")
+    parser.add_argument('--tolerance', type=int, default=DEFAULT_TOLERANCE,
+                        help='largest per-channel difference still counted as equal')
+    parser.add_argument('--resync', choices=('files', 'sheet'),
+                        help='files: rewrite drifted sprites/atlas copies from the reference sheet; '
+                             'sheet: paste drifted sprites into the sheet and rewrite every copy')
+    args = parser.parse_args()
+
+    table = sprite_table()
+    try:
+        reference, mismatches, notes = verify(table, args.tolerance)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    atlases = atlas_copies()
+    print(f"Reference: {os.path.relpath(reference, PROJECT_ROOT)}, {len(table)} regions, "
+          f"{len(atlases)} atlas copies, {len(sprite_files())} sprite files")
+    for note in notes:
+        print(f"  · {note}")
+    for mismatch in mismatches:
+        where = os.path.relpath(mismatch['path'], PROJECT_ROOT)
+        if 'size' in mismatch:
+            print(f"  ✗ {mismatch['name']} in {where}: size {mismatch['size']}")
+        else:
+            print(f"  ✗ {mismatch['name']} in {where}: {mismatch['pixels']} pixels differ "
+                  f"(max {mismatch['max_diff']})")
+    if not mismatches:
+        print("  ✓ No drift")
+        return
+
+    if args.resync:
+        sheet = decode_rgba(reference)
+        if args.resync == 'files':
+            resync_files(sheet, table, [m for m in mismatches if 'size' not in m], reference)
+        else:
+            sheet = resync_sheet(sheet, table, mismatches, atlases)
+            # Sprite copies outside the development directory follow the new sheet
+            _, remaining, _ = verify(table, args.tolerance)
+            resync_files(sheet, table, [m for m in remaining if 'size' not in m], reference)
+        return
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()